@@ -1,6 +1,14 @@
-from .base import BaseExchange
+from .base import BaseExchange, ExchangeGateways, PriceSeries, SystemClock
 from .binance import BinanceExchange
 from .bybit import BybitExchange
 from .okx import OkxExchange
 
-__all__ = ["BaseExchange", "OkxExchange", "BinanceExchange", "BybitExchange"]
+__all__ = [
+    "BaseExchange",
+    "ExchangeGateways",
+    "PriceSeries",
+    "SystemClock",
+    "OkxExchange",
+    "BinanceExchange",
+    "BybitExchange",
+]
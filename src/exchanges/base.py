@@ -3,7 +3,12 @@ import logging
 import threading
 import time
 from abc import ABC, abstractmethod
-from collections import deque
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Optional
 
 import ccxt
 from expiringdict import ExpiringDict
@@ -16,27 +21,146 @@ from utils.performance_monitor import performance_monitor
 HISTORICAL_PRICE_MAX_AGE_MS = 60 * 60 * 1000  # 1 hour in milliseconds
 HISTORICAL_PRICE_MAX_LEN = 3600  # Max records per symbol (1 per second for 1 hour)
 HISTORICAL_PRICE_CLEANUP_INTERVAL = 60  # Cleanup every 60 seconds
+TICKER_BATCH_SIZE = 100  # Max symbols per fetch_tickers request
+
+
+class PriceSeries:
+    """Time-ordered price history stored as parallel timestamp and price columns.
+
+    Timestamps (ms) and prices live in typed arrays rather than a sequence of
+    tuples, so lookups binary search a contiguous column. Entries evicted by
+    maxlen are only skipped via ``start`` and compacted away in one batch once
+    they number maxlen, keeping append amortised O(1).
+    """
+
+    __slots__ = ("timestamps", "prices", "maxlen", "start")
+
+    def __init__(self, entries=(), maxlen=HISTORICAL_PRICE_MAX_LEN):
+        self.timestamps = array("q")
+        self.prices = array("d")
+        self.maxlen = maxlen
+        self.start = 0
+        for timestamp, price in entries:
+            self.append(timestamp, price)
+
+    def __len__(self):
+        return len(self.timestamps) - self.start
+
+    def __getitem__(self, index):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("PriceSeries index out of range")
+        index += self.start
+        return self.timestamps[index], self.prices[index]
+
+    def __iter__(self):
+        return zip(islice(self.timestamps, self.start, None), islice(self.prices, self.start, None))
+
+    def append(self, timestamp: int, price: float) -> None:
+        """Append a newer entry, dropping the oldest once maxlen is exceeded."""
+        self.timestamps.append(timestamp)
+        self.prices.append(price)
+        if len(self) > self.maxlen:
+            self.start += 1
+            if self.start >= self.maxlen:
+                self._compact()
+
+    def drop_before(self, cutoff: int) -> int:
+        """Remove entries older than cutoff and return how many were removed."""
+        count = bisect_left(self.timestamps, cutoff, self.start) - self.start
+        if count:
+            self.start += count
+            self._compact()
+        return count
+
+    def _compact(self) -> None:
+        del self.timestamps[: self.start]
+        del self.prices[: self.start]
+        self.start = 0
+
+    def closest(self, target_time: int):
+        """Return the (timestamp, price) entry nearest to target_time.
+
+        Ties resolve to the earlier entry.
+        """
+        timestamps = self.timestamps
+        index = bisect_left(timestamps, target_time, self.start)
+        if index == self.start:
+            return self[0]
+        if index == len(timestamps):
+            return self[-1]
+        if target_time - timestamps[index - 1] > timestamps[index] - target_time:
+            return timestamps[index], self.prices[index]
+        return timestamps[index - 1], self.prices[index - 1]
+
+
+def _expiring_price_cache() -> ExpiringDict:
+    """Per-exchange price cache holding up to 1000 entries for 300 seconds."""
+    return ExpiringDict(max_len=1000, max_age_seconds=300)
+
+
+class SystemClock:
+    """Wall clock backed by the time module."""
+
+    def now(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        return event.wait(timeout)
+
+
+@dataclass
+class ExchangeGateways:
+    """External collaborators used by BaseExchange.
+
+    Production code relies on the defaults; tests pass fakes instead of
+    patching module attributes.
+    """
+
+    # Looked up when the gateways are built, so patching exchanges.base.ccxt takes effect
+    ccxt: Any = field(default_factory=lambda: ccxt)
+    price_cache: Any = price_cache
+    clock: Any = field(default_factory=SystemClock)
+    thread_factory: Callable[..., Any] = threading.Thread
+    price_cache_factory: Callable[[], Any] = _expiring_price_cache
+    logger: Any = logging.getLogger(__name__)
 
 
 class BaseExchange(ABC):
-    def __init__(self, exchange_name):
+    def __init__(self, exchange_name, gateways: Optional[ExchangeGateways] = None):
         try:
-            if exchange_name not in ccxt.exchanges:
+            self._gateways = gateways or ExchangeGateways()
+            self._price_cache = self._gateways.price_cache
+            self._clock = self._gateways.clock
+            self._thread_factory = self._gateways.thread_factory
+            self._logger = self._gateways.logger
+            ccxt_module = self._gateways.ccxt
+
+            if exchange_name not in ccxt_module.exchanges:
                 raise ValueError(f"Exchange {exchange_name} not supported by ccxt")
 
             self.exchange_name = exchange_name
-            self.exchange = getattr(ccxt, exchange_name)(
+            self.exchange = getattr(ccxt_module, exchange_name)(
                 {
                     "enableRateLimit": True,
                 }
             )
 
             # Cache for storing price data with TTL of 300 seconds
-            self.priceCache = ExpiringDict(max_len=1000, max_age_seconds=300)
+            self.priceCache = self._gateways.price_cache_factory()
+
+            # Worker thread for blocking ccxt calls, created on first use
+            self._executor = None
 
             # WebSocket related properties
             self.ws = None
-            self.ws_connected = False
+            # Set by the WebSocket thread once connected, see ws_connected
+            self._ws_ready = threading.Event()
             self.ws_data = {}
             self.last_prices = {}
             self.historical_prices = {}
@@ -44,7 +168,7 @@ class BaseExchange(ABC):
             self.ws_thread = None
             self.running = False
 
-            logging.info(f"BaseExchange initialized for {exchange_name}")
+            self._logger.info(f"BaseExchange initialized for {exchange_name}")
 
         except Exception as e:
             error_handler.handle_config_error(
@@ -58,51 +182,95 @@ class BaseExchange(ABC):
             )
             raise
 
+    @property
+    def ws_connected(self) -> bool:
+        """Whether the WebSocket connection is established."""
+        return self._ws_ready.is_set()
+
+    @ws_connected.setter
+    def ws_connected(self, connected: bool) -> None:
+        # Flipping the event wakes start_websocket as soon as the thread connects
+        if connected:
+            self._ws_ready.set()
+        else:
+            self._ws_ready.clear()
+
     def _get_ohlcv_params(self, symbol):
         """Parameters forwarded to fetch_ohlcv for historical data."""
         return {}
 
+    def _ccxt_executor(self) -> ThreadPoolExecutor:
+        """Single worker thread that runs every blocking call on this ccxt client.
+
+        ccxt's synchronous enableRateLimit throttle tracks the last request time
+        without any locking, so it only spaces requests correctly when they are
+        made one at a time. Routing all calls through one worker keeps them
+        ordered while still moving them off the event loop.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.exchange_name}-ccxt")
+        return self._executor
+
+    async def _fetch_tickers(self, symbols):
+        """Fetch tickers keyed by symbol, batching requests where the exchange supports it.
+
+        The blocking ccxt calls run on the client's worker thread, one at a time,
+        so the client's rate limiter spaces them out.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._ccxt_executor()
+
+        def run(func, arg):
+            return loop.run_in_executor(executor, func, arg)
+
+        if not self.exchange.has.get("fetchTickers"):
+            results = await asyncio.gather(*(run(self.exchange.fetch_ticker, symbol) for symbol in symbols))
+            return {symbol: ticker for symbol, ticker in zip(symbols, results) if ticker}
+
+        # Chunk so exchanges that cap symbols per request still get one call per batch
+        batches = [symbols[start : start + TICKER_BATCH_SIZE] for start in range(0, len(symbols), TICKER_BATCH_SIZE)]
+        tickers = {}
+        for batch in await asyncio.gather(*(run(self.exchange.fetch_tickers, batch) for batch in batches)):
+            tickers.update(batch or {})
+        return tickers
+
     def _store_historical_price(self, symbol: str, price: float) -> None:
         """Store historical price with automatic cleanup.
 
-        Uses deque for O(1) append and automatic size limiting.
+        Each symbol keeps a PriceSeries capped at HISTORICAL_PRICE_MAX_LEN entries.
         Periodic cleanup removes entries older than HISTORICAL_PRICE_MAX_AGE_MS.
         """
-        timestamp = int(time.time() * 1000)
+        timestamp = int(self._clock.now() * 1000)
 
-        # Initialize deque for new symbols
+        # Initialize series for new symbols
         if symbol not in self.historical_prices:
-            self.historical_prices[symbol] = deque(maxlen=HISTORICAL_PRICE_MAX_LEN)
+            self.historical_prices[symbol] = PriceSeries()
 
-        self.historical_prices[symbol].append((timestamp, price))
+        self.historical_prices[symbol].append(timestamp, price)
 
         # Periodic cleanup (not on every message)
-        current_time = time.time()
+        current_time = self._clock.now()
         if current_time - self._last_cleanup_time >= HISTORICAL_PRICE_CLEANUP_INTERVAL:
             self._cleanup_historical_prices()
             self._last_cleanup_time = current_time
 
     def _cleanup_historical_prices(self) -> None:
         """Remove historical price entries older than HISTORICAL_PRICE_MAX_AGE_MS."""
-        cutoff = int(time.time() * 1000) - HISTORICAL_PRICE_MAX_AGE_MS
+        cutoff = int(self._clock.now() * 1000) - HISTORICAL_PRICE_MAX_AGE_MS
         total_removed = 0
 
         for symbol in list(self.historical_prices.keys()):
             prices = self.historical_prices[symbol]
-            original_len = len(prices)
 
-            # Remove old entries from the left (oldest first)
-            while prices and prices[0][0] < cutoff:
-                prices.popleft()
+            # Entries are time ordered, so everything before the cutoff goes at once
+            total_removed += prices.drop_before(cutoff)
 
-            total_removed += original_len - len(prices)
-
-            # Remove empty deques
+            # Remove empty series
             if not prices:
                 del self.historical_prices[symbol]
 
         if total_removed > 0:
-            logging.debug(
+            self._logger.debug(
                 f"Cleaned up {total_removed} old historical price entries, "
                 f"{len(self.historical_prices)} symbols remaining"
             )
@@ -116,16 +284,16 @@ class BaseExchange(ABC):
     def start_websocket(self, symbols):
         """Start WebSocket connection thread"""
         try:
-            logging.info(f"Starting WebSocket connection for {self.exchange_name}, number of symbols: {len(symbols)}")
+            self._logger.info(f"Starting WebSocket connection for {self.exchange_name}, number of symbols: {len(symbols)}")
 
             # Print symbol list for debugging
             for i, symbol in enumerate(symbols):
-                logging.debug(f"Symbol {i + 1}/{len(symbols)}: {symbol}")
+                self._logger.debug(f"Symbol {i + 1}/{len(symbols)}: {symbol}")
 
             self.running = True
 
             def run_websocket_loop():
-                logging.info(f"WebSocket thread started, creating new event loop for {self.exchange_name}")
+                self._logger.info(f"WebSocket thread started, creating new event loop for {self.exchange_name}")
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
                 try:
@@ -140,24 +308,19 @@ class BaseExchange(ABC):
                         },
                         ErrorSeverity.ERROR,
                     )
-                    logging.error(f"Error running WebSocket thread: {e}")
+                    self._logger.error(f"Error running WebSocket thread: {e}")
                 finally:
-                    logging.info("WebSocket thread ending, closing event loop")
+                    self._logger.info("WebSocket thread ending, closing event loop")
                     loop.close()
 
-            self.ws_thread = threading.Thread(target=run_websocket_loop)
-            self.ws_thread.daemon = True
+            self.ws_thread = self._thread_factory(target=run_websocket_loop, daemon=True)
             self.ws_thread.start()
-            logging.info(f"WebSocket thread started: {self.ws_thread.name}")
+            self._logger.info(f"WebSocket thread started: {self.ws_thread.name}")
 
             # Wait for connection to establish
             timeout = 10
-            start_time = time.time()
-            logging.info(f"Waiting for WebSocket connection to establish, timeout: {timeout} seconds")
-            while not self.ws_connected and time.time() - start_time < timeout:
-                time.sleep(0.1)
-
-            if not self.ws_connected:
+            self._logger.info(f"Waiting for WebSocket connection to establish, timeout: {timeout} seconds")
+            if not self._clock.wait(self._ws_ready, timeout):
                 error_msg = "WebSocket connection establishment failed, timeout"
                 error_handler.handle_network_error(
                     Exception(error_msg),
@@ -170,7 +333,7 @@ class BaseExchange(ABC):
                 )
                 raise ConnectionError(error_msg)
 
-            logging.info(f"WebSocket connection successfully established, exchange: {self.exchange_name}")
+            self._logger.info(f"WebSocket connection successfully established, exchange: {self.exchange_name}")
 
         except Exception as e:
             error_handler.handle_network_error(
@@ -190,7 +353,7 @@ class BaseExchange(ABC):
         if self.ws_thread:
             self.ws_thread.join(timeout=5)
             self.ws_thread = None
-        logging.info(f"WebSocket connection closed for {self.exchange_name}")
+        self._logger.info(f"WebSocket connection closed for {self.exchange_name}")
 
     @error_handler.retry_with_backoff(max_retries=3, base_delay=1.0, max_delay=10.0)
     @performance_monitor.time_function("get_current_prices")
@@ -198,7 +361,7 @@ class BaseExchange(ABC):
         """Get current prices (from WebSocket data)"""
         try:
             # First try to get prices from cache
-            cached_prices = price_cache.get_prices(symbols)
+            cached_prices = self._price_cache.get_prices(symbols)
 
             # Check which symbols are missing from cache
             missing_symbols = [s for s in symbols if cached_prices.get(s) is None]
@@ -214,14 +377,15 @@ class BaseExchange(ABC):
                 # If WebSocket not connected, use API call
                 try:
                     timer_id = performance_monitor.start_timer("api_price_fetch")
+                    # One batched request instead of a round trip per symbol
+                    tickers = await self._fetch_tickers(missing_symbols)
                     for symbol in missing_symbols:
-                        # Call API to get price
-                        ticker = self.exchange.fetch_ticker(symbol)
+                        ticker = tickers.get(symbol)
                         if ticker and hasattr(ticker, "__getitem__") and "last" in ticker and ticker["last"]:
                             price = float(ticker["last"])
                             result[symbol] = price
                             # Update cache
-                            price_cache.set_price(symbol, price)
+                            self._price_cache.set_price(symbol, price)
                             performance_monitor.record_counter("cache_misses", 1)
                     performance_monitor.stop_timer(timer_id, "api_price_fetch")
                 except Exception as e:
@@ -235,30 +399,33 @@ class BaseExchange(ABC):
                         ErrorSeverity.WARNING,
                     )
                     performance_monitor.record_counter("api_errors", 1)
-                    logging.error(f"Error getting current prices via API: {e}")
+                    self._logger.error(f"Error getting current prices via API: {e}")
 
                 return result
 
-            # If WebSocket is connected, try to get from WebSocket data
-            for symbol in missing_symbols:
-                if symbol in self.last_prices:
-                    result[symbol] = self.last_prices[symbol]
-                    price_cache.set_price(symbol, self.last_prices[symbol])
-                    performance_monitor.record_counter("cache_misses", 1)
+            # If WebSocket is connected, try to get from WebSocket data in one lookup per symbol
+            last_prices = self.last_prices
+            ws_hits = {s: price for s in missing_symbols if (price := last_prices.get(s)) is not None}
+            if ws_hits:
+                result.update(ws_hits)
+                for symbol, price in ws_hits.items():
+                    self._price_cache.set_price(symbol, price)
+                performance_monitor.record_counter("cache_misses", len(ws_hits))
 
             # For symbols still missing, use API
-            still_missing = [s for s in symbols if result.get(s) is None]
+            still_missing = [s for s in missing_symbols if s not in ws_hits]
             if still_missing:
                 try:
                     timer_id = performance_monitor.start_timer("api_price_fetch_missing")
+                    # One batched request instead of a round trip per symbol
+                    tickers = await self._fetch_tickers(still_missing)
                     for symbol in still_missing:
-                        # Call API to get price
-                        ticker = self.exchange.fetch_ticker(symbol)
+                        ticker = tickers.get(symbol)
                         if ticker and hasattr(ticker, "__getitem__") and "last" in ticker and ticker["last"]:
                             price = float(ticker["last"])
                             result[symbol] = price
                             # Update cache
-                            price_cache.set_price(symbol, price)
+                            self._price_cache.set_price(symbol, price)
                             performance_monitor.record_counter("cache_misses", 1)
                     performance_monitor.stop_timer(timer_id, "api_price_fetch_missing")
                 except Exception as e:
@@ -272,7 +439,7 @@ class BaseExchange(ABC):
                         ErrorSeverity.WARNING,
                     )
                     performance_monitor.record_counter("api_errors", 1)
-                    logging.error(f"Error getting current prices for missing symbols: {e}")
+                    self._logger.error(f"Error getting current prices for missing symbols: {e}")
 
             # Record cache performance metrics
             total_symbols = len(symbols)
@@ -295,89 +462,66 @@ class BaseExchange(ABC):
             performance_monitor.record_counter("get_current_prices_errors", 1)
             raise
 
+    def _fetch_close_price(self, symbol, since):
+        """Fetch the 1m close price at ``since`` via the OHLCV API, or None."""
+        try:
+            ohlcv = self.exchange.fetch_ohlcv(
+                symbol,
+                "1m",
+                since=since,
+                limit=1,
+                params=self._get_ohlcv_params(symbol),
+            )
+        except Exception as e:
+            self._logger.error(f"Error getting historical prices: {e}")
+            return None
+
+        if ohlcv and len(ohlcv) > 0:
+            # OHLCV format: [timestamp, open, high, low, close, volume]
+            return float(ohlcv[0][4])  # Close price
+        return None
+
+    def _fetch_close_prices(self, symbols, minutes):
+        """Fetch close prices for several symbols through the client's rate-limited worker."""
+        since = int((self._clock.now() - minutes * 60) * 1000)  # Convert to milliseconds
+        prices = self._ccxt_executor().map(lambda symbol: self._fetch_close_price(symbol, since), symbols)
+        return {symbol: price for symbol, price in zip(symbols, prices) if price is not None}
+
     def get_price_minutes_ago(self, symbols, minutes):
         """Get prices from specified minutes ago (from historical data)"""
         if not self.ws_connected:
             # If WebSocket not connected, use API call
-            result = {}
-            try:
-                for symbol in symbols:
-                    # Get historical data
-                    since = int((time.time() - minutes * 60) * 1000)  # Convert to milliseconds
-                    ohlcv = self.exchange.fetch_ohlcv(
-                        symbol,
-                        "1m",
-                        since=since,
-                        limit=1,
-                        params=self._get_ohlcv_params(symbol),
-                    )
-
-                    if ohlcv and len(ohlcv) > 0:
-                        # OHLCV format: [timestamp, open, high, low, close, volume]
-                        price = float(ohlcv[0][4])  # Close price
-                        result[symbol] = price
-            except Exception as e:
-                logging.error(f"Error getting historical prices: {e}")
-
-            return result
+            return self._fetch_close_prices(symbols, minutes) if symbols else {}
 
-        target_time = int(time.time() * 1000) - (minutes * 60 * 1000)
+        target_time = int(self._clock.now() * 1000) - (minutes * 60 * 1000)
         result = {}
+        api_symbols = []
 
         for symbol in symbols:
             if symbol in self.historical_prices and self.historical_prices[symbol]:
                 # Find the price closest to target time
-                closest_price = min(
-                    self.historical_prices[symbol],
-                    key=lambda x: abs(x[0] - target_time),
-                )
+                closest_price = self.historical_prices[symbol].closest(target_time)
 
                 # If the closest price differs from target time by more than 10
                 # minutes, use API
                 if abs(closest_price[0] - target_time) > (10 * 60 * 1000):
-                    try:
-                        # Get historical data
-                        since = int((time.time() - minutes * 60) * 1000)  # Convert to milliseconds
-                        ohlcv = self.exchange.fetch_ohlcv(
-                            symbol,
-                            "1m",
-                            since=since,
-                            limit=1,
-                            params=self._get_ohlcv_params(symbol),
-                        )
-
-                        if ohlcv and len(ohlcv) > 0:
-                            # OHLCV format: [timestamp, open, high, low, close, volume]
-                            price = float(ohlcv[0][4])  # Close price
-                            result[symbol] = price
-                    except Exception as e:
-                        logging.error(f"Error getting historical prices: {e}")
+                    api_symbols.append(symbol)
                 else:
                     result[symbol] = closest_price[1]
             else:
-                try:
-                    # Get historical data
-                    since = int((time.time() - minutes * 60) * 1000)  # Convert to milliseconds
-                    ohlcv = self.exchange.fetch_ohlcv(
-                        symbol,
-                        "1m",
-                        since=since,
-                        limit=1,
-                        params=self._get_ohlcv_params(symbol),
-                    )
+                api_symbols.append(symbol)
 
-                    if ohlcv and len(ohlcv) > 0:
-                        # OHLCV format: [timestamp, open, high, low, close, volume]
-                        price = float(ohlcv[0][4])  # Close price
-                        result[symbol] = price
-                except Exception as e:
-                    logging.error(f"Error getting historical prices: {e}")
+        if api_symbols:
+            result.update(self._fetch_close_prices(api_symbols, minutes))
 
         return result
 
     def close(self):
         """Close connection"""
         self.stop_websocket()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
         if hasattr(self.exchange, "close"):
             self.exchange.close()
 
@@ -386,7 +530,7 @@ class BaseExchange(ABC):
         """Check WebSocket connection status and attempt to reconnect"""
         try:
             if not self.ws_connected and self.running:
-                logging.warning(f"{self.exchange_name} WebSocket connection disconnected, attempting to reconnect")
+                self._logger.warning(f"{self.exchange_name} WebSocket connection disconnected, attempting to reconnect")
                 # Get currently subscribed symbols
                 symbols = list(self.last_prices.keys())
                 if not symbols:
@@ -399,7 +543,7 @@ class BaseExchange(ABC):
                         },
                         ErrorSeverity.ERROR,
                     )
-                    logging.error("No available symbol list for reconnection")
+                    self._logger.error("No available symbol list for reconnection")
                     return False
 
                 # Restart WebSocket
@@ -416,7 +560,7 @@ class BaseExchange(ABC):
                         },
                         ErrorSeverity.ERROR,
                     )
-                    logging.error(f"WebSocket reconnection failed: {e}")
+                    self._logger.error(f"WebSocket reconnection failed: {e}")
                     return False
             return self.ws_connected
 
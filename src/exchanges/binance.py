@@ -1,43 +1,67 @@
 import asyncio
+import functools
 import json
-import logging
-import time
+import random
 
 import websockets
 
+from utils.rate_limiter import TokenBucket
+
 from .base import BaseExchange
 
+MAX_WS_RETRIES = 3  # Connection attempts before _ws_connect gives up
+
+# Reconnect backoff: 0.5s doubling up to 30s, plus up to 0.5s of jitter
+WS_RETRY_BASE_DELAY = 0.5
+WS_RETRY_MAX_DELAY = 30.0
+WS_RETRY_JITTER = 0.5
+
+
+@functools.lru_cache(maxsize=4096)
+def _symbol_to_stream(symbol):
+    """Ticker stream name for a ccxt symbol, e.g. BTC/USDT:USDT -> btcusdt@ticker."""
+    return f"{symbol.split(':')[0].replace('/', '').lower()}@ticker"
+
+
+def _reconnect_delay(attempt):
+    """Exponential backoff with jitter so reconnects after an outage spread out."""
+    return min(WS_RETRY_MAX_DELAY, WS_RETRY_BASE_DELAY * 2**attempt) + random.uniform(0, WS_RETRY_JITTER)
+
 
 class BinanceExchange(BaseExchange):
+    # Shared by all instances: Binance limits connection attempts per IP
+    _connect_bucket = TokenBucket(rate=1.0, capacity=5)
+
     def __init__(self):
         super().__init__("binance")
         self.exchange.options["defaultType"] = "future"
 
     async def _ws_connect(self, symbols):
         """Establish WebSocket connection and subscribe to market data"""
-        logging.info(
+        self._logger.info(
             f"Attempting to establish WebSocket connection for {self.exchange_name}, subscribing symbols: {symbols}"
         )
 
-        max_retries = 3
+        max_retries = MAX_WS_RETRIES
         retry_count = 0
 
+        # Binance uses a different URI structure
+        # wss://stream.binance.com:9443/ws/btcusdt@ticker/ethusdt@ticker
+        # Symbols are fixed for this call, so the URI and reverse lookup are built
+        # once rather than on every retry and every message
+        uri = f"wss://fstream.binance.com/ws/{'/'.join(map(_symbol_to_stream, symbols))}"
+        # Reversed so the first matching symbol wins, as with a linear search
+        original_symbols = {s.split(":")[0].replace("/", "").upper(): s for s in reversed(symbols)}
+
         while retry_count < max_retries and self.running:
             try:
-                # Binance uses a different URI structure
-                # wss://stream.binance.com:9443/ws/btcusdt@ticker/ethusdt@ticker
-                streams = []
-                for symbol in symbols:
-                    base_symbol = symbol.split(":")[0]
-                    formatted = base_symbol.replace("/", "").lower()
-                    streams.append(f"{formatted}@ticker")
-                uri = f"wss://fstream.binance.com/ws/{'/'.join(streams)}"
-                logging.debug(f"Binance WebSocket URI: {uri}")
+                self._logger.debug(f"Binance WebSocket URI: {uri}")
 
+                await self._connect_bucket.acquire()
                 async with websockets.connect(uri) as websocket:
                     self.ws = websocket
                     self.ws_connected = True
-                    logging.info("Binance WebSocket connection established")
+                    self._logger.info("Binance WebSocket connection established")
 
                     # Binance does not require a subscription message for ticker streams
 
@@ -51,7 +75,7 @@ class BinanceExchange(BaseExchange):
                             if "e" in data and data["e"] == "ping":
                                 pong_frame = await websocket.ping()
                                 await websocket.send(pong_frame)
-                                logging.debug("Ping received, pong sent")
+                                self._logger.debug("Ping received, pong sent")
                                 continue
 
                             # Process ticker data
@@ -60,18 +84,15 @@ class BinanceExchange(BaseExchange):
                                 price = float(data["c"])
                                 # Binance symbols are uppercase, but stream is lowercase
                                 # We need to find the original symbol format
-                                original_symbol = next(
-                                    (s for s in symbols if s.split(":")[0].replace("/", "").upper() == symbol.upper()),
-                                    symbol,
-                                )
+                                original_symbol = original_symbols.get(symbol.upper(), symbol)
                                 canonical_symbol = original_symbol
                                 if ":" not in canonical_symbol:
                                     canonical_symbol = f"{original_symbol}:USDT"
                                 self.last_prices[canonical_symbol] = price
 
                                 # Log received price data every 10 minutes
-                                if time.time() % 600 < 1:  # Approximately every 10 minutes
-                                    logging.info(
+                                if self._clock.now() % 600 < 1:  # Approximately every 10 minutes
+                                    self._logger.info(
                                         "Binance price update - %s: %s",
                                         canonical_symbol,
                                         price,
@@ -80,19 +101,19 @@ class BinanceExchange(BaseExchange):
                                 # Store historical data using base class method
                                 self._store_historical_price(canonical_symbol, price)
                         except Exception as e:
-                            logging.error(f"Binance WebSocket data processing error: {e}")
+                            self._logger.error(f"Binance WebSocket data processing error: {e}")
                             break
 
                     self.ws_connected = False
-                    logging.warning("Binance WebSocket connection closed")
+                    self._logger.warning("Binance WebSocket connection closed")
 
                 # If connection successful, break retry loop
                 break
 
             except Exception as e:
-                logging.error(f"Error establishing WebSocket connection (attempt {retry_count + 1}/{max_retries}): {e}")
+                self._logger.error(f"Error establishing WebSocket connection (attempt {retry_count + 1}/{max_retries}): {e}")
+                await asyncio.sleep(_reconnect_delay(retry_count))
                 retry_count += 1
-                await asyncio.sleep(5)  # Wait 5 seconds before retrying
 
         if not self.ws_connected:
-            logging.error(f"Unable to establish WebSocket connection after {max_retries} attempts")
+            self._logger.error(f"Unable to establish WebSocket connection after {max_retries} attempts")
@@ -1,7 +1,5 @@
 import asyncio
 import json
-import logging
-import time
 
 import websockets
 
@@ -15,7 +13,7 @@ class BybitExchange(BaseExchange):
 
     async def _ws_connect(self, symbols):
         """Establish WebSocket connection and subscribe to market data"""
-        logging.info(
+        self._logger.info(
             f"Attempting to establish WebSocket connection for {self.exchange_name}, subscribing symbols: {symbols}"
         )
 
@@ -27,7 +25,7 @@ class BybitExchange(BaseExchange):
                 # Bybit uses different endpoints for spot and derivatives
                 # This implementation will focus on the unified public endpoint
                 uri = "wss://stream.bybit.com/v5/public/linear"
-                logging.debug(f"Bybit WebSocket URI: {uri}")
+                self._logger.debug(f"Bybit WebSocket URI: {uri}")
 
                 subscribe_msg = {"op": "subscribe", "args": []}
 
@@ -36,16 +34,16 @@ class BybitExchange(BaseExchange):
                     formatted_symbol = base_symbol.replace("/", "")
                     subscribe_msg["args"].append(f"tickers.{formatted_symbol}")
 
-                logging.debug(f"Subscription message: {subscribe_msg}")
+                self._logger.debug(f"Subscription message: {subscribe_msg}")
 
                 async with websockets.connect(uri) as websocket:
                     self.ws = websocket
                     self.ws_connected = True
-                    logging.info("Bybit WebSocket connection established")
+                    self._logger.info("Bybit WebSocket connection established")
 
                     # Send subscription request
                     await websocket.send(json.dumps(subscribe_msg))
-                    logging.info("Subscription request sent to Bybit")
+                    self._logger.info("Subscription request sent to Bybit")
 
                     # Continuously receive data
                     while self.running:
@@ -57,7 +55,7 @@ class BybitExchange(BaseExchange):
                             if "op" in data and data.get("op") == "ping":
                                 pong_msg = {"op": "pong", "req_id": data.get("req_id")}
                                 await websocket.send(json.dumps(pong_msg))
-                                logging.debug("Heartbeat response sent")
+                                self._logger.debug("Heartbeat response sent")
                                 continue
 
                             if "topic" in data and "tickers" in data["topic"]:
@@ -73,8 +71,8 @@ class BybitExchange(BaseExchange):
                                 self.last_prices[canonical_symbol] = price
 
                                 # Log received price data every 10 minutes
-                                if time.time() % 600 < 1:
-                                    logging.info(
+                                if self._clock.now() % 600 < 1:
+                                    self._logger.info(
                                         "Bybit price update - %s: %s",
                                         canonical_symbol,
                                         price,
@@ -84,19 +82,19 @@ class BybitExchange(BaseExchange):
                                 self._store_historical_price(canonical_symbol, price)
 
                         except Exception as e:
-                            logging.error(f"Bybit WebSocket data processing error: {e}")
+                            self._logger.error(f"Bybit WebSocket data processing error: {e}")
                             break
 
                     self.ws_connected = False
-                    logging.warning("Bybit WebSocket connection closed")
+                    self._logger.warning("Bybit WebSocket connection closed")
 
                 # If connection successful, break retry loop
                 break
 
             except Exception as e:
-                logging.error(f"Error establishing WebSocket connection (attempt {retry_count + 1}/{max_retries}): {e}")
+                self._logger.error(f"Error establishing WebSocket connection (attempt {retry_count + 1}/{max_retries}): {e}")
                 retry_count += 1
                 await asyncio.sleep(5)  # Wait 5 seconds before retrying
 
         if not self.ws_connected:
-            logging.error(f"Unable to establish WebSocket connection after {max_retries} attempts")
+            self._logger.error(f"Unable to establish WebSocket connection after {max_retries} attempts")
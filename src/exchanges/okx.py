@@ -1,7 +1,5 @@
 import asyncio
 import json
-import logging
-import time
 
 import websockets
 
@@ -22,7 +20,7 @@ class OkxExchange(BaseExchange):
         try:
             self.exchange.load_markets(reload=True, params={"instType": "SWAP"})
         except Exception as exc:
-            logging.debug(f"Failed to preload OKX swap markets: {exc}")
+            self._logger.debug(f"Failed to preload OKX swap markets: {exc}")
 
     def _get_ohlcv_params(self, symbol):
         """Ensure only swap markets are requested for historical data."""
@@ -45,7 +43,7 @@ class OkxExchange(BaseExchange):
 
     async def _ws_connect(self, symbols):
         """Establish WebSocket connection and subscribe to market data"""
-        logging.info(
+        self._logger.info(
             f"Attempting to establish WebSocket connection for {self.exchange_name}, subscribing symbols: {symbols}"
         )
 
@@ -55,7 +53,7 @@ class OkxExchange(BaseExchange):
         while retry_count < max_retries and self.running:
             try:
                 uri = "wss://ws.okx.com:8443/ws/v5/public"
-                logging.debug(f"OKX WebSocket URI: {uri}")
+                self._logger.debug(f"OKX WebSocket URI: {uri}")
 
                 # Prepare subscription message - modify format to meet OKX
                 # requirements
@@ -70,20 +68,20 @@ class OkxExchange(BaseExchange):
 
                     subscribe_msg["args"].append({"channel": "tickers", "instId": formatted_symbol})
 
-                logging.debug(f"Subscription message: {subscribe_msg}")
+                self._logger.debug(f"Subscription message: {subscribe_msg}")
 
                 async with websockets.connect(uri) as websocket:
                     self.ws = websocket
                     self.ws_connected = True
-                    logging.info("OKX WebSocket connection established")
+                    self._logger.info("OKX WebSocket connection established")
 
                     # Send subscription request
                     await websocket.send(json.dumps(subscribe_msg))
-                    logging.info("Subscription request sent to OKX")
+                    self._logger.info("Subscription request sent to OKX")
 
                     # Wait for subscription confirmation
                     response = await websocket.recv()
-                    logging.debug(f"Subscription response: {response}")
+                    self._logger.debug(f"Subscription response: {response}")
 
                     # Continuously receive data
                     while self.running:
@@ -95,7 +93,7 @@ class OkxExchange(BaseExchange):
                             if "event" in data and data["event"] == "ping":
                                 pong_msg = {"event": "pong"}
                                 await websocket.send(json.dumps(pong_msg))
-                                logging.debug("Heartbeat response sent")
+                                self._logger.debug("Heartbeat response sent")
                                 continue
 
                             # Process ticker data
@@ -107,25 +105,25 @@ class OkxExchange(BaseExchange):
                                     self.last_prices[symbol] = price
 
                                     # Log received price data every 10 minutes
-                                    if time.time() % 600 < 1:  # Approximately every 10 minutes
-                                        logging.info(f"OKX price update - {symbol}: {price}")
+                                    if self._clock.now() % 600 < 1:  # Approximately every 10 minutes
+                                        self._logger.info(f"OKX price update - {symbol}: {price}")
 
                                     # Store historical data using base class method
                                     self._store_historical_price(symbol, price)
                         except Exception as e:
-                            logging.error(f"OKX WebSocket data processing error: {e}")
+                            self._logger.error(f"OKX WebSocket data processing error: {e}")
                             break
 
                     self.ws_connected = False
-                    logging.warning("OKX WebSocket connection closed")
+                    self._logger.warning("OKX WebSocket connection closed")
 
                 # If connection successful, break retry loop
                 break
 
             except Exception as e:
-                logging.error(f"Error establishing WebSocket connection (attempt {retry_count + 1}/{max_retries}): {e}")
+                self._logger.error(f"Error establishing WebSocket connection (attempt {retry_count + 1}/{max_retries}): {e}")
                 retry_count += 1
                 await asyncio.sleep(5)  # Wait 5 seconds before retrying
 
         if not self.ws_connected:
-            logging.error(f"Unable to establish WebSocket connection after {max_retries} attempts")
+            self._logger.error(f"Unable to establish WebSocket connection after {max_retries} attempts")
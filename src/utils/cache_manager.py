@@ -11,7 +11,7 @@ import time
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 
 class CacheStrategy(Enum):
@@ -33,16 +33,16 @@ class CacheEntry:
     last_access: float = field(default_factory=time.time)
     ttl: Optional[float] = None
 
-    def is_expired(self) -> bool:
-        """Check if entry is expired."""
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check if entry is expired as of ``now`` (defaults to the current time)."""
         if self.ttl is None:
             return False
-        return time.time() - self.timestamp > self.ttl
+        return (time.time() if now is None else now) - self.timestamp > self.ttl
 
-    def update_access(self):
+    def update_access(self, now: Optional[float] = None):
         """Update access metadata."""
         self.access_count += 1
-        self.last_access = time.time()
+        self.last_access = time.time() if now is None else now
 
 
 class CacheManager:
@@ -53,6 +53,7 @@ class CacheManager:
         max_size: int = 1000,
         default_ttl: Optional[float] = None,
         strategy: CacheStrategy = CacheStrategy.LRU,
+        clock: Callable[[], float] = time.time,
     ):
         """
         Initialize cache manager.
@@ -61,12 +62,14 @@ class CacheManager:
             max_size: Maximum number of entries in cache
             default_ttl: Default time-to-live in seconds
             strategy: Cache eviction strategy
+            clock: Time source for entry timestamps and expiry checks
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
         self.strategy = strategy
+        self._now = clock
+        # Ordered oldest first; LRU hits move entries to the end
         self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        self.access_order: list = []  # Track access order for LRU
         self.lock = threading.RLock()
         self.logger = logging.getLogger(__name__)
 
@@ -83,6 +86,11 @@ class CacheManager:
 
         self.logger.info(f"CacheManager initialized with strategy={strategy}, max_size={max_size}")
 
+    @property
+    def access_order(self) -> List[str]:
+        """Keys in eviction order, next candidate first."""
+        return list(self.cache.keys())
+
     def _generate_key(self, key: Union[str, tuple, dict]) -> str:
         """Generate consistent cache key from various input types."""
         if isinstance(key, str):
@@ -96,54 +104,34 @@ class CacheManager:
 
     def _evict_if_needed(self):
         """Evict entries if cache is full."""
-        if len(self.cache) >= self.max_size:
+        if len(self.cache) >= self.max_size and self.cache:
             self.evictions += 1
 
-            if self.strategy == CacheStrategy.LRU:
-                # Remove least recently used (first in access_order)
-                if self.access_order:
-                    lru_key = self.access_order.pop(0)
-                    if lru_key in self.cache:
-                        del self.cache[lru_key]
-            elif self.strategy == CacheStrategy.LFU:
+            if self.strategy == CacheStrategy.LFU:
                 # Remove least frequently used
                 lfu_key = min(self.cache.keys(), key=lambda k: self.cache[k].access_count)
                 del self.cache[lfu_key]
-                if lfu_key in self.access_order:
-                    self.access_order.remove(lfu_key)
-            elif self.strategy == CacheStrategy.FIFO:
-                # Remove first in (first in access_order)
-                if self.access_order:
-                    fifo_key = self.access_order.pop(0)
-                    if fifo_key in self.cache:
-                        del self.cache[fifo_key]
-            elif self.strategy == CacheStrategy.TTL:
-                # Remove expired entries first, then LRU
-                expired_keys = [k for k, entry in self.cache.items() if entry.is_expired()]
-                if expired_keys:
-                    expired_key = expired_keys[0]
+                return
+
+            if self.strategy == CacheStrategy.TTL:
+                # Remove the oldest expired entry first, then fall back to LRU
+                now = self._now()
+                expired_key = next((k for k, entry in self.cache.items() if entry.is_expired(now)), None)
+                if expired_key is not None:
                     del self.cache[expired_key]
-                    if expired_key in self.access_order:
-                        self.access_order.remove(expired_key)
                     self.expirations += 1
-                else:
-                    # Remove least recently used
-                    if self.access_order:
-                        lru_key = self.access_order.pop(0)
-                        if lru_key in self.cache:
-                            del self.cache[lru_key]
+                    return
+
+            # LRU and FIFO both drop the entry at the front of the ordered dict
+            self.cache.popitem(last=False)
 
     def _cleanup_expired(self):
         """Clean up expired entries."""
-        expired_keys = []
-        for key, entry in self.cache.items():
-            if entry.is_expired():
-                expired_keys.append(key)
+        now = self._now()
+        expired_keys = [key for key, entry in self.cache.items() if entry.is_expired(now)]
 
         for key in expired_keys:
             del self.cache[key]
-            if key in self.access_order:
-                self.access_order.remove(key)
             self.expirations += 1
 
         if expired_keys:
@@ -164,30 +152,21 @@ class CacheManager:
         cache_key = self._generate_key(key)
 
         with self.lock:
-            # Clean up expired entries periodically
-            if self.access_count % 100 == 0:
-                self._cleanup_expired()
-
-            if cache_key in self.cache:
-                entry = self.cache[cache_key]
-
-                if entry.is_expired():
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                now = self._now()
+                # Expiry is checked lazily on access instead of scanning the whole cache
+                if entry.is_expired(now):
                     del self.cache[cache_key]
-                    if cache_key in self.access_order:
-                        self.access_order.remove(cache_key)
                     self.expirations += 1
                     self.misses += 1
                 else:
                     # Update access metadata
-                    entry.update_access()
+                    entry.update_access(now)
 
                     # Move to end for LRU
                     if self.strategy == CacheStrategy.LRU:
                         self.cache.move_to_end(cache_key)
-                        # Update access order
-                        if cache_key in self.access_order:
-                            self.access_order.remove(cache_key)
-                        self.access_order.append(cache_key)
 
                     self.hits += 1
                     self.access_count += 1
@@ -212,18 +191,16 @@ class CacheManager:
         entry_ttl = ttl if ttl is not None else self.default_ttl
 
         with self.lock:
-            # Evict if needed
-            self._evict_if_needed()
+            # Evict if needed; overwriting an existing key needs no room
+            if cache_key not in self.cache:
+                self._evict_if_needed()
 
             # Create new entry
-            entry = CacheEntry(value=value, ttl=entry_ttl)
+            now = self._now()
+            entry = CacheEntry(value=value, timestamp=now, last_access=now, ttl=entry_ttl)
 
             self.cache[cache_key] = entry
 
-            # Add to access order (for new entries)
-            if cache_key not in self.access_order:
-                self.access_order.append(cache_key)
-
             self.logger.debug(f"Cached entry with key: {cache_key}")
 
     def delete(self, key: Union[str, tuple, dict]) -> bool:
@@ -241,9 +218,6 @@ class CacheManager:
         with self.lock:
             if cache_key in self.cache:
                 del self.cache[cache_key]
-                # Remove from access order
-                if cache_key in self.access_order:
-                    self.access_order.remove(cache_key)
                 self.logger.debug(f"Deleted cache entry with key: {cache_key}")
                 return True
             return False
@@ -252,7 +226,6 @@ class CacheManager:
         """Clear all entries from cache."""
         with self.lock:
             self.cache.clear()
-            self.access_order.clear()
             self.logger.info("Cache cleared")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -298,7 +271,7 @@ class CacheManager:
         """Check if key exists in cache."""
         cache_key = self._generate_key(key)
         with self.lock:
-            return cache_key in self.cache and not self.cache[cache_key].is_expired()
+            return cache_key in self.cache and not self.cache[cache_key].is_expired(self._now())
 
     def size(self) -> int:
         """Get current cache size."""
@@ -362,7 +335,8 @@ class CacheManager:
     def get_expired_entries(self) -> List[str]:
         """Get list of expired entry keys."""
         with self.lock:
-            return [key for key, entry in self.cache.items() if entry.is_expired()]
+            now = self._now()
+            return [key for key, entry in self.cache.items() if entry.is_expired(now)]
 
     def cleanup_expired_entries(self) -> int:
         """Clean up all expired entries and return count."""
@@ -630,17 +604,20 @@ class AlertHistoryManager:
 class NotificationCooldownManager:
     """Manager for per-symbol notification cooldowns."""
 
-    def __init__(self, default_cooldown_seconds: float = 300.0):
+    def __init__(self, default_cooldown_seconds: float = 300.0, clock: Callable[[], float] = time.time):
         """
         Initialize cooldown manager.
 
         Args:
             default_cooldown_seconds: Default cooldown period in seconds
+            clock: Time source for cooldown start and expiry
         """
+        self._now = clock
         self._cache = CacheManager(
             max_size=2000,
             default_ttl=default_cooldown_seconds,
             strategy=CacheStrategy.TTL,
+            clock=clock,
         )
         self.logger = logging.getLogger(__name__)
 
@@ -669,7 +646,7 @@ class NotificationCooldownManager:
             symbol: Trading pair symbol
             cooldown_seconds: Optional custom cooldown period in seconds
         """
-        self._cache.set(symbol, time.time(), ttl=cooldown_seconds)
+        self._cache.set(symbol, self._now(), ttl=cooldown_seconds)
         self.logger.debug(f"Notification recorded for {symbol}, cooldown started")
 
     def get_remaining_cooldown(self, symbol: str) -> float:
@@ -686,8 +663,9 @@ class NotificationCooldownManager:
         with self._cache.lock:
             if cache_key in self._cache.cache:
                 entry = self._cache.cache[cache_key]
-                if not entry.is_expired():
-                    elapsed = time.time() - entry.timestamp
+                now = self._now()
+                if not entry.is_expired(now):
+                    elapsed = now - entry.timestamp
                     return max(0.0, entry.ttl - elapsed)
         return 0.0
 
@@ -1,5 +1,97 @@
+import functools
 import json
-import re
+import os
+import string
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; its JSONDecodeError subclasses the stdlib one
+    _loads = json.loads
+
+SUPPORTED_MARKETS_FILE = "config/supported_markets.json"
+
+_USDT_QUOTE = "USDT:USDT"
+
+
+def _file_version(path):
+    """Modification time used to invalidate the parsed markets cache."""
+    return os.stat(path).st_mtime_ns
+
+
+@functools.lru_cache(maxsize=4)
+def _load_supported_markets(path, version):
+    """Parse the supported markets file once per path and modification time.
+
+    The result is shared between callers, so market lists are frozen into tuples.
+    """
+    with open(path, "rb") as f:
+        data = _loads(f.read())
+    return {exchange: tuple(markets) for exchange, markets in data.items()}
+
+
+def _read_supported_markets(path=SUPPORTED_MARKETS_FILE):
+    return _load_supported_markets(path, _file_version(path))
+
+
+def _base_symbol(market):
+    """Extract the base of a USDT-margined market such as "1000SHIB/USDT:USDT".
+
+    Trailing digits are dropped from the base, and spaces are allowed around "/"
+    only when the base has none. Returns None for any other market.
+    """
+    head, sep, tail = market.partition("/")
+    if not sep or tail.lstrip() != _USDT_QUOTE:
+        return None
+
+    base = head.rstrip()
+    core = base.rstrip(string.digits)
+    letters = core.lstrip(string.digits)
+    if not (letters.isascii() and letters.isalpha()):
+        return None
+    if core != base and (base != head or tail != _USDT_QUOTE):
+        return None
+    return core
+
+
+@functools.lru_cache(maxsize=8)
+def _build_index(markets):
+    """Map each upper-cased USDT-margined base symbol to its first market, in market order.
+
+    markets is the tuple cached by _load_supported_markets, so the index is
+    built once per exchange and file version.
+    """
+    index = {}
+    for market in markets:
+        base_symbol = _base_symbol(market)
+        if base_symbol:
+            index.setdefault(base_symbol.upper(), market)
+    return index
+
+
+def _resolve(index, symbols):
+    """Map each symbol to the market whose base contains it, preferring the shortest base.
+
+    Exact bases are dict hits; the remaining symbols share a single pass over the
+    index that keeps the best base seen so far for each of them.
+    """
+    # An exact base is always the shortest base containing the symbol
+    resolved = {symbol: index[symbol] for symbol in symbols if symbol in index}
+    pending = [symbol for symbol in symbols if symbol not in resolved]
+    if not pending:
+        return resolved
+
+    best = {}
+    for base_symbol, market in index.items():
+        for symbol in pending:
+            if symbol in base_symbol:
+                prev = best.get(symbol)
+                if prev is None or len(base_symbol) < len(prev[0]):
+                    best[symbol] = (base_symbol, market)
+
+    resolved.update((symbol, market) for symbol, (_, market) in best.items())
+    return resolved
 
 
 def match_symbols(symbols, exchange):
@@ -9,7 +101,7 @@ def match_symbols(symbols, exchange):
     Parameters
     ----------
     symbols : list
-        List of symbols to match
+        List of symbols to match; surrounding whitespace and case are ignored
     exchange : str
         Exchange to match the symbols against
 
@@ -20,8 +112,7 @@ def match_symbols(symbols, exchange):
     """
 
     try:
-        with open("config/supported_markets.json", "r") as f:
-            supported_markets = json.load(f)
+        supported_markets = _read_supported_markets()
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
@@ -29,22 +120,21 @@ def match_symbols(symbols, exchange):
         print(f"Exchange {exchange} not supported.")
         return []
 
-    usdt_pattern = re.compile(r"(\d*[A-Za-z]+)\d*/USDT:USDT$|(\d*[A-Za-z]+)\s*/\s*USDT:USDT$")
+    index = _build_index(supported_markets[exchange])
+
+    # Normalise and dedupe the input once, keeping its order
+    wanted = dict.fromkeys(symbol.strip().upper() for symbol in symbols)
+    wanted.pop("", None)
+
+    resolved = _resolve(index, wanted)
 
     matched_symbols = []
+    seen = set()
 
-    for symbol in symbols:
-        matched_symbol = None
-        shortest_match = None
-        for market in supported_markets[exchange]:
-            match = usdt_pattern.match(market)
-            if match:
-                base_symbol = match.group(1) if match.group(1) else match.group(2)
-                if symbol in base_symbol:
-                    if shortest_match is None or len(base_symbol) < len(shortest_match):
-                        shortest_match = base_symbol
-                        matched_symbol = market
-        if matched_symbol and matched_symbol not in matched_symbols:
+    for symbol in wanted:
+        matched_symbol = resolved.get(symbol)
+        if matched_symbol and matched_symbol not in seen:
+            seen.add(matched_symbol)
             matched_symbols.append(matched_symbol)
 
     return matched_symbols
@@ -1,10 +1,24 @@
+import functools
+
+_INVALID_FORMAT = "Invalid timeframe format. Use 'Xm', 'Xh', or 'Xd'."
+
+# Suffix -> (minutes per unit, largest value that still rounds down to 0 minutes)
+_UNITS = {
+    "m": (1, 0.05),
+    "h": (60, 0.005),
+    "d": (1440, 0.001),
+}
+
+
+@functools.lru_cache(maxsize=64)
 def parse_timeframe(timeframe):
     """
     Converts a timeframe string into minutes.
 
     The input string should represent a timeframe, ending with 'm', 'h', or 'd',
     indicating minutes, hours, and days respectively. The numeric part of the string
-    is parsed and converted to minutes.
+    is parsed and converted to minutes. Results are cached, since callers keep
+    re-parsing the same few configured timeframes.
 
     Args:
         timeframe (str): A string representing a timeframe, e.g., '15m', '2h', '1d'.
@@ -18,22 +32,31 @@ def parse_timeframe(timeframe):
 
     # Check for whitespace
     if " " in timeframe or "\t" in timeframe or "\n" in timeframe:
-        raise ValueError("Invalid timeframe format. Use 'Xm', 'Xh', or 'Xd'.")
-
-    if timeframe.endswith("m"):
-        value = float(timeframe[:-1])
-        if value < 0:
-            raise ValueError("Invalid timeframe format. Use 'Xm', 'Xh', or 'Xd'.")
-        return 0 if value <= 0.05 else int(value)  # Values <= 0.05m return 0
-    elif timeframe.endswith("h"):
-        value = float(timeframe[:-1])
-        if value < 0:
-            raise ValueError("Invalid timeframe format. Use 'Xm', 'Xh', or 'Xd'.")
-        return 0 if value <= 0.005 else int(value * 60)  # Values <= 0.005h return 0
-    elif timeframe.endswith("d"):
-        value = float(timeframe[:-1])
-        if value < 0:
-            raise ValueError("Invalid timeframe format. Use 'Xm', 'Xh', or 'Xd'.")
-        return 0 if value <= 0.001 else int(value * 1440)  # Values <= 0.001d return 0
-    else:
-        raise ValueError("Invalid timeframe format. Use 'Xm', 'Xh', or 'Xd'.")
+        raise ValueError(_INVALID_FORMAT)
+
+    unit = _UNITS.get(timeframe[-1:])
+    if unit is None:
+        raise ValueError(_INVALID_FORMAT)
+
+    multiplier, zero_below = unit
+    value = float(timeframe[:-1])
+    if value < 0:
+        raise ValueError(_INVALID_FORMAT)
+    return 0 if value <= zero_below else int(value * multiplier)
+
+
+def parse_timeframes(timeframes):
+    """
+    Converts a sequence of timeframe strings into minutes, keeping their order.
+
+    Args:
+        timeframes (Iterable[str]): Timeframe strings such as ('5m', '1h', '1d').
+
+    Returns:
+        list[int]: The equivalent number of minutes for each timeframe.
+
+    Raises:
+        ValueError: On the first timeframe whose format is invalid.
+    """
+    parse = parse_timeframe
+    return [parse(timeframe) for timeframe in timeframes]
@@ -0,0 +1,41 @@
+"""
+Rate limiting utilities for PriceSentry system.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Token bucket that spaces out an operation to ``rate`` per second.
+
+    Up to ``capacity`` calls may run back to back before callers start waiting.
+    The bucket is guarded by a thread lock rather than an asyncio primitive, so a
+    single instance can be shared by WebSocket loops running on separate threads.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative; the deficit is the caller's place in the queue
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
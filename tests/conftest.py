@@ -2,11 +2,16 @@
 Pytest configuration and shared fixtures for PriceSentry tests.
 """
 
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
 from unittest.mock import MagicMock
 
 import pytest
 import yaml
 
+from exchanges.base import BaseExchange, ExchangeGateways
+
 
 @pytest.fixture
 def sample_config():
@@ -69,3 +74,278 @@ def temp_symbols_file(tmp_path, sample_symbols):
         for symbol in sample_symbols:
             f.write(f"{symbol}\n")
     return str(symbols_file)
+
+
+@dataclass
+class FakeCcxtExchange:
+    """ccxt client fake with canned responses and plain call lists."""
+
+    tickers: dict = field(default_factory=dict)
+    ohlcv: Optional[list] = None
+    ticker_error: Optional[Exception] = None
+    ohlcv_error: Optional[Exception] = None
+    options: dict = field(default_factory=dict)
+    has: dict = field(default_factory=lambda: {"fetchTickers": True})
+    fetch_ticker_calls: list = field(default_factory=list)
+    fetch_tickers_calls: list = field(default_factory=list)
+    fetch_ohlcv_calls: list = field(default_factory=list)
+    close_calls: int = 0
+
+    def fetch_ticker(self, symbol):
+        self.fetch_ticker_calls.append(symbol)
+        if self.ticker_error is not None:
+            raise self.ticker_error
+        return self.tickers.get(symbol)
+
+    def fetch_tickers(self, symbols=None, params=None):
+        self.fetch_tickers_calls.append(list(symbols))
+        if self.ticker_error is not None:
+            raise self.ticker_error
+        return {s: self.tickers[s] for s in symbols if s in self.tickers}
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None, params=None):
+        self.fetch_ohlcv_calls.append((symbol, timeframe, since, limit, params))
+        if self.ohlcv_error is not None:
+            raise self.ohlcv_error
+        return self.ohlcv
+
+    def close(self):
+        self.close_calls += 1
+
+    def reset(self):
+        self.tickers = {}
+        self.ohlcv = None
+        self.ticker_error = None
+        self.ohlcv_error = None
+        self.options = {}
+        self.has = {"fetchTickers": True}
+        self.fetch_ticker_calls = []
+        self.fetch_tickers_calls = []
+        self.fetch_ohlcv_calls = []
+        self.close_calls = 0
+
+
+class FakeCcxt:
+    """Stand-in for the ccxt module that only knows about Binance."""
+
+    def __init__(self, exchanges=("binance",)):
+        # frozenset keeps BaseExchange's "name in ccxt.exchanges" guard a hash lookup
+        self.exchanges = frozenset(exchanges)
+        self.client = FakeCcxtExchange()
+        self.binance_calls = []
+
+    def binance(self, options):
+        """Return the single memoized client, recording the constructor options."""
+        self.binance_calls.append(options)
+        return self.client
+
+
+class FakePriceCache:
+    """In-memory replacement for the global price cache."""
+
+    def __init__(self):
+        self.prices = {}
+        self.get_calls = []
+        self.set_calls = []
+
+    def get_prices(self, symbols):
+        self.get_calls.append(list(symbols))
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+    def set_price(self, symbol, price):
+        self.set_calls.append((symbol, price))
+        self.prices[symbol] = price
+
+    def reset(self):
+        self.prices = {}
+        self.get_calls = []
+        self.set_calls = []
+
+
+class FakeClock:
+    """Deterministic clock whose sleeps advance time instead of blocking."""
+
+    def __init__(self, start=1640995200.0, script=()):
+        self.start = start
+        self.reset(script)
+
+    def now(self):
+        return self._t
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self._t += next(self._script, seconds)
+
+    def wait(self, event, timeout):
+        """Return at once if the event is set, otherwise time out without blocking."""
+        self.waits.append(timeout)
+        if event.is_set():
+            return True
+        self._t += timeout
+        return False
+
+    def reset(self, script=()):
+        """Rewind to the start time; scripted deltas replace the next sleep durations."""
+        self._t = self.start
+        self._script = iter(script)
+        self.sleeps = []
+        self.waits = []
+
+
+class FakeThread:
+    """Thread stand-in that never runs its target on its own."""
+
+    def __init__(self, target=None, daemon=None, on_start=None, name="FakeThread"):
+        self.target = target
+        self.daemon = daemon
+        self.name = name
+        self.on_start = on_start
+        self.start_calls = 0
+        self.join_calls = []
+
+    def start(self):
+        self.start_calls += 1
+        if self.on_start is not None:
+            self.on_start()
+
+    def join(self, timeout=None):
+        self.join_calls.append(timeout)
+
+
+class FakeThreadFactory:
+    """Callable replacing threading.Thread that records the threads it builds."""
+
+    def __init__(self):
+        self.reset()
+
+    def __call__(self, target=None, daemon=None):
+        thread = FakeThread(target=target, daemon=daemon, on_start=self.on_start)
+        self.threads.append(thread)
+        return thread
+
+    def reset(self):
+        self.on_start = None
+        self.threads = []
+
+
+class FakeLogger:
+    """Logger stand-in collecting (level, message) records."""
+
+    def __init__(self):
+        self.records = []
+
+    def _log(self, level, msg, *args, **kwargs):
+        self.records.append((level, msg % args if args else msg))
+
+    def debug(self, msg, *args, **kwargs):
+        self._log("DEBUG", msg, *args)
+
+    def info(self, msg, *args, **kwargs):
+        self._log("INFO", msg, *args)
+
+    def warning(self, msg, *args, **kwargs):
+        self._log("WARNING", msg, *args)
+
+    def error(self, msg, *args, **kwargs):
+        self._log("ERROR", msg, *args)
+
+    def messages(self, level):
+        return [msg for record_level, msg in self.records if record_level == level]
+
+
+class _TestExchangeImpl(BaseExchange):
+    """Test implementation of BaseExchange for testing purposes."""
+
+    def __init__(self, exchange_name, gateways=None):
+        # Mock the abstract method implementation
+        self._ws_connect_called = False
+        super().__init__(exchange_name, gateways)
+
+    @classmethod
+    def build_for_test(cls, gateways, *, ws_connected=False, last_prices=None):
+        """Build an instance without running BaseExchange.__init__.
+
+        Skips the supported-exchange check and the price cache factory; only the
+        init tests need the full constructor.
+        """
+        inst = cls.__new__(cls)
+        inst._ws_ready = threading.Event()
+        inst._gateways = gateways
+        inst._price_cache = gateways.price_cache
+        inst._clock = gateways.clock
+        inst._thread_factory = gateways.thread_factory
+        inst._logger = gateways.logger
+        inst.exchange_name = "binance"
+        inst.exchange = gateways.ccxt.binance({"enableRateLimit": True})
+        inst.priceCache = {}
+        inst._executor = None
+        inst._reset_for_test()
+        inst.ws_connected = ws_connected
+        inst.last_prices = dict(last_prices or {})
+        return inst
+
+    async def _ws_connect(self, symbols):
+        """Mock implementation for testing."""
+        self._ws_connect_called = True
+        self.ws_connected = True
+        # Simulate some WebSocket data
+        for symbol in symbols:
+            self.last_prices[symbol] = 50000.0  # Mock price
+
+    def _reset_for_test(self):
+        """Restore the per-test mutable state to its freshly constructed values."""
+        self._ws_connect_called = False
+        self.priceCache.clear()
+        self.ws = None
+        self.ws_connected = False
+        self.ws_data = {}
+        self.last_prices = {}
+        self.historical_prices = {}
+        self._last_cleanup_time = 0
+        self.ws_thread = None
+        self.running = False
+        # Drop per-test overrides such as a recording start_websocket
+        self.__dict__.pop("start_websocket", None)
+
+
+@pytest.fixture(scope="session")
+def test_exchange_cls():
+    """Concrete BaseExchange subclass used by the exchange tests."""
+    return _TestExchangeImpl
+
+
+def _make_fake_gateways():
+    return ExchangeGateways(
+        ccxt=FakeCcxt(),
+        price_cache=FakePriceCache(),
+        clock=FakeClock(),
+        thread_factory=FakeThreadFactory(),
+        price_cache_factory=dict,
+        logger=FakeLogger(),
+    )
+
+
+@pytest.fixture
+def fake_gateways():
+    """Fresh exchange gateways backed by fakes."""
+    return _make_fake_gateways()
+
+
+@pytest.fixture(scope="module")
+def _shared_base_exchange(test_exchange_cls):
+    """Exchange and fake gateways built once per module."""
+    gateways = _make_fake_gateways()
+    return test_exchange_cls.build_for_test(gateways), gateways
+
+
+@pytest.fixture
+def base_exchange(_shared_base_exchange):
+    """Shared test exchange with its state and fakes reset for each test."""
+    exchange, gateways = _shared_base_exchange
+    exchange._reset_for_test()
+    gateways.price_cache.reset()
+    gateways.clock.reset()
+    gateways.thread_factory.reset()
+    gateways.logger.records.clear()
+    gateways.ccxt.client.reset()
+    return exchange, gateways
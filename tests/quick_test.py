@@ -8,16 +8,77 @@ import os
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import websocket
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库
+    _loads = json.loads
+
+BASE_URL = "http://localhost:8000"
+API_URL = f"{BASE_URL}/api"
+
+# 所有请求共用一个会话，复用 keep-alive 连接而不是每次请求重新建立 TCP 连接
+SESSION = requests.Session()
+
+
+def wait_until(predicate, timeout=2.0, interval=0.05):
+    """轮询直到 predicate() 为真或超时；条件满足返回 True，超时返回 False"""
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+
+
+def prepare(method, endpoint):
+    """预先构建请求（URL、会话级请求头），循环内只需发送"""
+    return SESSION.prepare_request(requests.Request(method, f"{API_URL}/{endpoint}"))
+
+
+# 启动轮询会反复请求健康检查，只构建一次
+_HEALTH_REQUEST = prepare("GET", "health")
+
+
+def _service_ready():
+    """健康检查端点可访问即视为服务就绪"""
+    try:
+        return SESSION.send(_HEALTH_REQUEST, timeout=1).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+def get_json(prepared, timeout=5):
+    """发送请求并只解码一次响应体；非 2xx 状态抛出 HTTPError"""
+    response = SESSION.send(prepared, timeout=timeout)
+    response.raise_for_status()
+    return _loads(response.content)
+
+
+def _check_endpoint(prepared, description):
+    """发送预构建的请求，返回 (是否通过, 输出信息)"""
+    try:
+        success = get_json(prepared).get("success")
+    except requests.HTTPError as e:
+        return False, f"❌ {description} - HTTP {e.response.status_code}"
+    except Exception as e:
+        return False, f"❌ {description} - 连接错误: {e}"
+
+    if success is not False:
+        return True, f"✅ {description} - 正常"
+    return False, f"❌ {description} - 数据错误"
+
 
 def test_api_endpoints():
     """快速测试主要API端点"""
-    base_url = "http://localhost:8000"
-    api_url = f"{base_url}/api"
-
     print("🧪 快速API测试")
     print("=" * 40)
 
@@ -32,30 +93,39 @@ def test_api_endpoints():
         ("symbols", "交易对列表"),
     ]
 
-    results = []
+    prepared = [(prepare("GET", endpoint), description) for endpoint, description in endpoints]
+
+    # 并发请求所有端点，总耗时约等于最慢的一次请求；输出仍按端点顺序
+    with ThreadPoolExecutor(max_workers=len(prepared)) as executor:
+        checks = list(executor.map(lambda item: _check_endpoint(*item), prepared))
+
+    for _, line in checks:
+        print(line)
+
+    return all(ok for ok, _ in checks)
 
-    for endpoint, description in endpoints:
+
+def receive_messages(ws, count, timeout):
+    """在截止时间内接收至多 count 条消息，每帧一条"""
+    messages = []
+    deadline = time.monotonic() + timeout
+    while len(messages) < count:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        ws.settimeout(remaining)
         try:
-            url = f"{api_url}/{endpoint}"
-            response = requests.get(url, timeout=5)
-
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("success") is not False:
-                    print(f"✅ {description} - 正常")
-                    results.append(True)
-                else:
-                    print(f"❌ {description} - 数据错误")
-                    results.append(False)
-            else:
-                print(f"❌ {description} - HTTP {response.status_code}")
-                results.append(False)
+            # recv_data 返回帧的原始字节，跳过 recv() 的 UTF-8 解码，直接交给 _loads 解析
+            opcode, raw = ws.recv_data()
+        except websocket.WebSocketTimeoutException:
+            break
+        if opcode in (websocket.ABNF.OPCODE_TEXT, websocket.ABNF.OPCODE_BINARY):
+            messages.append(_loads(raw))
+    return messages
 
-        except Exception as e:
-            print(f"❌ {description} - 连接错误: {e}")
-            results.append(False)
 
-    return all(results)
+# 初始推送必须包含的数据段；frozenset 让成员检查为哈希查找
+_INITIAL_DATA_SECTIONS = frozenset({"prices", "alerts", "stats"})
 
 
 def test_websocket():
@@ -67,21 +137,17 @@ def test_websocket():
         ws = websocket.create_connection("ws://localhost:8000/ws", timeout=10)
 
         # 接收初始数据
-        message = ws.recv()
-        data = json.loads(message)
+        messages = receive_messages(ws, count=1, timeout=10)
+        data = next((m for m in messages if m.get("type") == "initial_data"), None)
 
-        if data.get("type") == "initial_data":
+        if data is not None:
             print("✅ WebSocket连接 - 正常")
-            print(f"   数据类型: {data.get('type')}")
+            print("   数据类型: initial_data")
             print(f"   时间戳: {data.get('timestamp')}")
 
             # 检查数据结构
-            data_content = data.get("data", {})
-            if (
-                "prices" in data_content
-                and "alerts" in data_content
-                and "stats" in data_content
-            ):
+            data_content = data.get("data") or {}
+            if _INITIAL_DATA_SECTIONS.issubset(data_content):
                 print("✅ 数据结构 - 完整")
                 ws.close()
                 return True
@@ -114,8 +180,8 @@ def start_pricesentry():
             cwd=project_root,
         )
 
-        # 等待服务启动
-        time.sleep(15)
+        # 等待服务启动：就绪即返回，最多等待15秒；进程提前退出时立即停止等待
+        wait_until(lambda: process.poll() is not None or _service_ready(), timeout=15, interval=0.05)
 
         if process.poll() is None:
             print("✅ 服务启动成功")
@@ -177,6 +243,8 @@ def main():
             return False
 
     finally:
+        SESSION.close()
+
         # 停止服务
         print("\n🛑 停止服务...")
         process.terminate()
@@ -97,6 +97,37 @@ class TestCacheManager:
         assert cache.get("key3") == "value3"  # Should exist
         assert cache.get("key4") == "value4"  # Should exist
 
+    def test_lru_hit_moves_entry_to_end(self):
+        """Test LRU hits reorder the backing OrderedDict instead of a side list."""
+        cache = CacheManager(max_size=3, default_ttl=300)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key3", "value3")
+
+        cache.get("key1")
+
+        assert cache.access_order == ["key2", "key3", "key1"]
+
+        # Overwriting an existing key in a full cache evicts nothing
+        cache.set("key2", "updated")
+        assert cache.size() == 3
+        assert cache.evictions == 0
+
+    def test_expired_entries_removed_lazily(self):
+        """Test expired entries are dropped when accessed, without a full scan."""
+        cache = CacheManager(max_size=10, default_ttl=300)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        # Age both entries past their TTL
+        for entry in cache.cache.values():
+            entry.timestamp -= 301
+
+        assert cache.get("key1") is None
+
+        # Only the accessed entry was removed
+        assert list(cache.cache) == ["key2"]
+        assert cache.expirations == 1
+
     def test_delete(self):
         """Test deleting items from cache."""
         self.cache.set("key1", "value1")
@@ -2,6 +2,7 @@
 Tests for core/sentry.py - PriceSentry main controller.
 """
 
+from itertools import count
 from unittest.mock import Mock, patch
 
 import pytest
@@ -273,8 +274,8 @@ class TestPriceSentry:
             mock_exchange.ws_connected = False
             mock_exchange.check_ws_connection = Mock()
 
-            # Simulate time passing and websocket check
-            with patch("time.time", side_effect=[0, 60, 120]), patch(
+            # Simulate time passing and websocket check; an endless clock cannot run dry
+            with patch("time.time", side_effect=count(0, 60)), patch(
                 "asyncio.sleep", side_effect=KeyboardInterrupt()
             ):
                 await sentry.run()
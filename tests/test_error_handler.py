@@ -2,7 +2,9 @@
 Test cases for error handling system.
 """
 
-import time
+import re
+from datetime import datetime, timedelta
+from itertools import count
 from unittest.mock import Mock, patch
 
 import pytest
@@ -15,6 +17,52 @@ from utils.error_handler import (
     ErrorSeverity,
 )
 
+SYSTEM = ErrorCategory.SYSTEM
+API = ErrorCategory.API
+NETWORK = ErrorCategory.NETWORK
+CONFIGURATION = ErrorCategory.CONFIGURATION
+ERROR = ErrorSeverity.ERROR
+WARNING = ErrorSeverity.WARNING
+CRITICAL = ErrorSeverity.CRITICAL
+
+_FAIL_RE = re.compile("Failure")
+_PERSIST_RE = re.compile("Persistent failure")
+
+# A single retry and the default-sized loop
+_RETRY_COUNTS = [1, 3]
+
+
+def _counting(side_effect=None, return_value=None):
+    """Build a plain callable that counts its invocations without Mock bookkeeping."""
+    calls = [0]
+
+    def func(*args, **kwargs):
+        calls[0] += 1
+        if side_effect is not None:
+            raise side_effect
+        return return_value
+
+    func.call_count = lambda: calls[0]
+    return func
+
+
+def _failing_then_succeeding(fail_n, message="Failure"):
+    """Build a callable that raises on its first ``fail_n`` calls, then returns "success"."""
+
+    counter = count(1)
+    calls = 0
+
+    def func():
+        nonlocal calls
+        calls = next(counter)
+        if calls <= fail_n:
+            raise Exception(message)
+        return "success"
+
+    # Read-only view of the closed-over count, matching _counting
+    func.call_count = lambda: calls
+    return func
+
 
 class TestErrorHandler:
     """Test error handling functionality."""
@@ -23,6 +71,35 @@ class TestErrorHandler:
         """Setup test environment."""
         self.error_handler = ErrorHandler()
 
+    @pytest.fixture(autouse=True)
+    def _frozen(self, monkeypatch):
+        """Freeze the error handler clock so backoff and recovery never block."""
+        clock = [datetime(2024, 1, 1)]
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock[0]
+
+        monkeypatch.setattr("utils.error_handler.datetime", FrozenDatetime)
+        monkeypatch.setattr("utils.error_handler.time.sleep", lambda seconds: None)
+        self._advance = lambda seconds: clock.__setitem__(0, clock[0] + timedelta(seconds=seconds))
+
+    @pytest.fixture
+    def decorated_retry(self):
+        """Function wrapped by retry_with_backoff, failing on its first call."""
+        return self.error_handler.retry_with_backoff(max_retries=2, base_delay=0.1)(
+            _failing_then_succeeding(1, "Test failure")
+        )
+
+    @pytest.fixture
+    def decorated_protect(self):
+        """Function wrapped by circuit_breaker_protect, failing on its first two calls."""
+        cb = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+        self.error_handler.circuit_breakers["test_circuit"] = cb
+
+        return cb, self.error_handler.circuit_breaker_protect("test_circuit")(_failing_then_succeeding(2))
+
     def test_init(self):
         """Test ErrorHandler initialization."""
         assert self.error_handler.max_history_size == 1000
@@ -37,8 +114,8 @@ class TestErrorHandler:
         error_info = self.error_handler._log_error(
             error_code="TEST_ERROR",
             error_message="Test error message",
-            error_category=ErrorCategory.SYSTEM,
-            severity=ErrorSeverity.ERROR,
+            error_category=SYSTEM,
+            severity=ERROR,
             context=context,
             original_error=error,
         )
@@ -46,8 +123,8 @@ class TestErrorHandler:
         assert isinstance(error_info, ErrorInfo)
         assert error_info.error_code == "TEST_ERROR"
         assert error_info.error_message == "Test error message"
-        assert error_info.error_category == ErrorCategory.SYSTEM
-        assert error_info.severity == ErrorSeverity.ERROR
+        assert error_info.error_category == SYSTEM
+        assert error_info.severity == ERROR
         assert error_info.context == context
         assert error_info.original_error == error
 
@@ -60,8 +137,8 @@ class TestErrorHandler:
         error_info = self.error_handler._log_error(
             error_code="RETRY_ERROR",
             error_message="Retry error",
-            error_category=ErrorCategory.NETWORK,
-            severity=ErrorSeverity.WARNING,
+            error_category=NETWORK,
+            severity=WARNING,
             context={},
         )
 
@@ -71,56 +148,44 @@ class TestErrorHandler:
 
     def test_retry_with_backoff_success(self):
         """Test retry with backoff on successful execution."""
-        mock_func = Mock(return_value="success")
+        mock_func = _counting(return_value="success")
 
         result = self.error_handler.retry_with_backoff(
             mock_func, max_retries=3, base_delay=0.1
         )()
 
         assert result == "success"
-        assert mock_func.call_count == 1
+        assert mock_func.call_count() == 1
 
     def test_retry_with_backoff_with_exception_then_success(self):
         """Test retry with backoff when function fails then succeeds."""
         mock_func = Mock(side_effect=[Exception("First failure"), "success"])
 
-        with patch("time.sleep"):  # Mock sleep to speed up test
-            result = self.error_handler.retry_with_backoff(
-                mock_func, max_retries=3, base_delay=0.1
-            )()
+        result = self.error_handler.retry_with_backoff(
+            mock_func, max_retries=3, base_delay=0.1
+        )()
 
         assert result == "success"
         assert mock_func.call_count == 2
 
-    def test_retry_with_backoff_exhausted_retries(self):
+    @pytest.mark.parametrize("max_retries", _RETRY_COUNTS)
+    def test_retry_with_backoff_exhausted_retries(self, max_retries):
         """Test retry with backoff when all retries are exhausted."""
-        mock_func = Mock(side_effect=Exception("Persistent failure"))
+        mock_func = _counting(side_effect=Exception("Persistent failure"))
 
-        with patch("time.sleep"):  # Mock sleep to speed up test
-            with pytest.raises(Exception, match="Persistent failure"):
-                self.error_handler.retry_with_backoff(
-                    mock_func, max_retries=3, base_delay=0.1
-                )()
+        with pytest.raises(Exception, match=_PERSIST_RE):
+            self.error_handler.retry_with_backoff(
+                mock_func, max_retries=max_retries, base_delay=0.1
+            )()
 
-        assert mock_func.call_count == 4  # 1 initial + 3 retries
+        assert mock_func.call_count() == max_retries + 1  # 1 initial + retries
 
-    def test_retry_with_backoff_decorator(self):
+    def test_retry_with_backoff_decorator(self, decorated_retry):
         """Test retry with backoff as decorator."""
-
-        @self.error_handler.retry_with_backoff(max_retries=2, base_delay=0.1)
-        def test_function():
-            if not hasattr(test_function, "call_count"):
-                test_function.call_count = 0
-            test_function.call_count += 1
-            if test_function.call_count < 2:
-                raise Exception("Test failure")
-            return "success"
-
-        with patch("time.sleep"):  # Mock sleep to speed up test
-            result = test_function()
+        result = decorated_retry()
 
         assert result == "success"
-        assert test_function.call_count == 2
+        assert decorated_retry.__wrapped__.call_count() == 2
 
     @pytest.mark.asyncio
     async def test_retry_with_backoff_async_success(self):
@@ -158,7 +223,8 @@ class TestErrorHandler:
         assert call_count == 2
 
     @pytest.mark.asyncio
-    async def test_retry_with_backoff_async_exhausted_retries(self):
+    @pytest.mark.parametrize("max_retries", _RETRY_COUNTS)
+    async def test_retry_with_backoff_async_exhausted_retries(self, max_retries):
         """Test async retry with backoff when all retries are exhausted."""
 
         call_count = 0
@@ -169,12 +235,12 @@ class TestErrorHandler:
             raise Exception("Persistent failure")
 
         with patch("asyncio.sleep"):  # Mock sleep to speed up test
-            with pytest.raises(Exception, match="Persistent failure"):
+            with pytest.raises(Exception, match=_PERSIST_RE):
                 await self.error_handler.retry_with_backoff_async(
-                    mock_func, max_retries=3, base_delay=0.1
+                    mock_func, max_retries=max_retries, base_delay=0.1
                 )
 
-        assert call_count == 4  # 1 initial + 3 retries
+        assert call_count == max_retries + 1  # 1 initial + retries
 
     def test_circuit_breaker_initial_state(self):
         """Test circuit breaker initial state."""
@@ -189,7 +255,7 @@ class TestErrorHandler:
     def test_circuit_breaker_success_call(self):
         """Test circuit breaker with successful call."""
         cb = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
-        mock_func = Mock(return_value="success")
+        mock_func = _counting(return_value="success")
 
         result = cb.call(mock_func)
 
@@ -200,26 +266,27 @@ class TestErrorHandler:
     def test_circuit_breaker_failure_under_threshold(self):
         """Test circuit breaker with failures under threshold."""
         cb = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
-        mock_func = Mock(side_effect=Exception("Failure"))
+        mock_func = _counting(side_effect=Exception("Failure"))
 
         for i in range(2):
-            with pytest.raises(Exception, match="Failure"):
+            with pytest.raises(Exception, match=_FAIL_RE):
                 cb.call(mock_func)
 
         assert cb.failure_count == 2
         assert cb.state == "CLOSED"
 
-    def test_circuit_breaker_failure_over_threshold(self):
+    @pytest.mark.parametrize("failure_threshold", _RETRY_COUNTS)
+    def test_circuit_breaker_failure_over_threshold(self, failure_threshold):
         """Test circuit breaker with failures over threshold."""
-        cb = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
-        mock_func = Mock(side_effect=Exception("Failure"))
+        cb = CircuitBreaker(failure_threshold=failure_threshold, recovery_timeout=60)
+        mock_func = _counting(side_effect=Exception("Failure"))
 
         # Trigger failures to open circuit
-        for i in range(3):
-            with pytest.raises(Exception, match="Failure"):
+        for i in range(failure_threshold):
+            with pytest.raises(Exception, match=_FAIL_RE):
                 cb.call(mock_func)
 
-        assert cb.failure_count == 3
+        assert cb.failure_count == failure_threshold
         assert cb.state == "OPEN"  # lowercase in implementation
 
         # Next call should raise CircuitBreakerOpenError
@@ -229,20 +296,20 @@ class TestErrorHandler:
     def test_circuit_breaker_recovery(self):
         """Test circuit breaker recovery after timeout."""
         cb = CircuitBreaker(failure_threshold=3, recovery_timeout=0.1)
-        mock_func = Mock(side_effect=Exception("Failure"))
+        mock_func = _counting(side_effect=Exception("Failure"))
 
         # Trigger failures to open circuit
         for i in range(3):
-            with pytest.raises(Exception, match="Failure"):
+            with pytest.raises(Exception, match=_FAIL_RE):
                 cb.call(mock_func)
 
         assert cb.state == "OPEN"
 
         # Wait for recovery timeout
-        time.sleep(0.2)
+        self._advance(0.2)
 
         # Next call should be attempted (half-open state)
-        with pytest.raises(Exception, match="Failure"):
+        with pytest.raises(Exception, match=_FAIL_RE):
             cb.call(mock_func)
 
         # Should still be open due to failure
@@ -253,23 +320,17 @@ class TestErrorHandler:
         cb = CircuitBreaker(failure_threshold=3, recovery_timeout=0.1)
 
         # Function that fails initially, then succeeds
-        def failing_then_succeeding():
-            if not hasattr(failing_then_succeeding, "call_count"):
-                failing_then_succeeding.call_count = 0
-            failing_then_succeeding.call_count += 1
-            if failing_then_succeeding.call_count <= 3:
-                raise Exception("Failure")
-            return "success"
+        failing_then_succeeding = _failing_then_succeeding(3)
 
         # Trigger failures to open circuit
         for i in range(3):
-            with pytest.raises(Exception, match="Failure"):
+            with pytest.raises(Exception, match=_FAIL_RE):
                 cb.call(failing_then_succeeding)
 
         assert cb.state == "OPEN"
 
         # Wait for recovery timeout
-        time.sleep(0.2)
+        self._advance(0.2)
 
         # Next call should succeed and close circuit
         result = cb.call(failing_then_succeeding)
@@ -277,23 +338,13 @@ class TestErrorHandler:
         assert cb.failure_count == 0
         assert cb.state == "CLOSED"
 
-    def test_circuit_breaker_protect_decorator(self):
+    def test_circuit_breaker_protect_decorator(self, decorated_protect):
         """Test circuit breaker protect decorator."""
-        cb = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
-        self.error_handler.circuit_breakers["test_circuit"] = cb
-
-        @self.error_handler.circuit_breaker_protect("test_circuit")
-        def test_function():
-            if not hasattr(test_function, "call_count"):
-                test_function.call_count = 0
-            test_function.call_count += 1
-            if test_function.call_count <= 2:
-                raise Exception("Failure")
-            return "success"
+        cb, test_function = decorated_protect
 
         # Trigger failures to open circuit
         for i in range(2):
-            with pytest.raises(Exception, match="Failure"):
+            with pytest.raises(Exception, match=_FAIL_RE):
                 test_function()
 
         # Circuit should be open now
@@ -311,8 +362,8 @@ class TestErrorHandler:
         error_info = self.error_handler.handle_api_error(error, context)
 
         assert isinstance(error_info, ErrorInfo)
-        assert error_info.error_category == ErrorCategory.API
-        assert error_info.severity == ErrorSeverity.ERROR
+        assert error_info.error_category == API
+        assert error_info.severity == ERROR
         assert error_info.context == context
         assert error_info.original_error == error
 
@@ -322,12 +373,12 @@ class TestErrorHandler:
         context = {"host": "api.example.com", "port": 443}
 
         error_info = self.error_handler.handle_network_error(
-            error, context, ErrorSeverity.ERROR
+            error, context, ERROR
         )
 
         assert isinstance(error_info, ErrorInfo)
-        assert error_info.error_category == ErrorCategory.NETWORK
-        assert error_info.severity == ErrorSeverity.ERROR
+        assert error_info.error_category == NETWORK
+        assert error_info.severity == ERROR
         assert error_info.context == context
 
     def test_handle_config_error(self):
@@ -336,31 +387,32 @@ class TestErrorHandler:
         context = {"config_file": "config.yaml", "section": "database"}
 
         error_info = self.error_handler.handle_config_error(
-            error, context, ErrorSeverity.CRITICAL
+            error, context, CRITICAL
         )
 
         assert isinstance(error_info, ErrorInfo)
-        assert error_info.error_category == ErrorCategory.CONFIGURATION
-        assert error_info.severity == ErrorSeverity.CRITICAL
+        assert error_info.error_category == CONFIGURATION
+        assert error_info.severity == CRITICAL
         assert error_info.context == context
 
     def test_error_history_limit(self):
         """Test error history size limit."""
         self.error_handler.max_history_size = 3
 
-        # Add more errors than the limit
-        for i in range(5):
+        # One more error than the limit is enough to exercise eviction
+        for i in range(4):
             self.error_handler._log_error(
                 error_code=f"ERROR_{i}",
                 error_message=f"Error {i}",
-                error_category=ErrorCategory.SYSTEM,
-                severity=ErrorSeverity.ERROR,
+                error_category=SYSTEM,
+                severity=ERROR,
                 context={},
             )
 
         # Should only keep the most recent errors
         assert len(self.error_handler.error_history) == 3
-        assert self.error_handler.error_history[-1].error_code == "ERROR_4"
+        assert self.error_handler.error_history[0].error_code == "ERROR_1"
+        assert self.error_handler.error_history[-1].error_code == "ERROR_3"
 
     def test_get_error_stats(self):
         """Test error statistics generation."""
@@ -368,24 +420,24 @@ class TestErrorHandler:
         self.error_handler._log_error(
             error_code="API_ERROR",
             error_message="API Error",
-            error_category=ErrorCategory.API,
-            severity=ErrorSeverity.ERROR,
+            error_category=API,
+            severity=ERROR,
             context={},
         )
 
         self.error_handler._log_error(
             error_code="NETWORK_ERROR",
             error_message="Network Error",
-            error_category=ErrorCategory.NETWORK,
-            severity=ErrorSeverity.WARNING,
+            error_category=NETWORK,
+            severity=WARNING,
             context={},
         )
 
         self.error_handler._log_error(
             error_code="ANOTHER_API_ERROR",
             error_message="Another API Error",
-            error_category=ErrorCategory.API,
-            severity=ErrorSeverity.ERROR,
+            error_category=API,
+            severity=ERROR,
             context={},
         )
 
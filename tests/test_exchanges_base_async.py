@@ -0,0 +1,169 @@
+"""
+Tests for exchanges/base.py - async current price lookups.
+"""
+
+import threading
+import time
+from types import MappingProxyType
+
+import pytest
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+BTC = "BTC/USDT"
+ETH = "ETH/USDT"
+SYMBOLS_BTC = (BTC,)
+SYMBOLS_BOTH = (BTC, ETH)
+TICKER_BTC = MappingProxyType({"last": 50000.0, "symbol": BTC})
+TICKER_ETH = MappingProxyType({"last": 3000.0, "symbol": ETH})
+RATE_LIMITED_SYMBOLS = tuple(f"COIN{i}/USDT" for i in range(4))
+RATE_LIMIT_SECONDS = 0.02
+
+
+class TestBaseExchangeCurrentPrices:
+    """Test cases for TestExchangeImpl.get_current_prices."""
+
+    @pytest.mark.parametrize(
+        "ws_connected, last_prices, cached, tickers, expected, tickers_calls, cache_writes",
+        [
+            pytest.param(
+                False,
+                {},
+                {BTC: 50000.0},
+                {},
+                {BTC: 50000.0},
+                [[ETH]],
+                [],
+                id="no_websocket_with_cache",
+            ),
+            pytest.param(
+                False,
+                {},
+                {},
+                {BTC: TICKER_BTC},
+                {BTC: 50000.0},
+                [list(SYMBOLS_BOTH)],
+                [(BTC, 50000.0)],
+                id="no_websocket_api_call",
+            ),
+            pytest.param(
+                True,
+                {BTC: 50000.0, ETH: 3000.0},
+                {},
+                {},
+                {BTC: 50000.0, ETH: 3000.0},
+                [],
+                [(BTC, 50000.0), (ETH, 3000.0)],
+                id="with_websocket",
+            ),
+            pytest.param(
+                True,
+                {BTC: 50000.0},
+                {},
+                {ETH: TICKER_ETH},
+                {BTC: 50000.0, ETH: 3000.0},
+                [[ETH]],
+                [(BTC, 50000.0), (ETH, 3000.0)],
+                id="mixed_sources",
+            ),
+            pytest.param(
+                False,
+                {},
+                {},
+                {BTC: MappingProxyType({"last": None, "symbol": BTC})},
+                {},
+                [list(SYMBOLS_BOTH)],
+                [],
+                id="ticker_without_last_price",
+            ),
+        ],
+    )
+    async def test_get_current_prices(
+        self, base_exchange, ws_connected, last_prices, cached, tickers, expected, tickers_calls, cache_writes
+    ):
+        """Test current prices resolved from the cache, WebSocket data and the API."""
+        exchange, gateways = base_exchange
+        client = gateways.ccxt.client
+        client.tickers = tickers
+        gateways.price_cache.prices = dict(cached)
+        exchange.ws_connected = ws_connected
+        exchange.last_prices = dict(last_prices)
+
+        result = await exchange.get_current_prices(list(SYMBOLS_BOTH))
+
+        assert result == expected
+        # Verify cache was checked before falling back to other sources
+        assert gateways.price_cache.get_calls == [list(SYMBOLS_BOTH)]
+        # Missing symbols are fetched in one batched request
+        assert client.fetch_tickers_calls == tickers_calls
+        assert client.fetch_ticker_calls == []
+        assert gateways.price_cache.set_calls == cache_writes
+
+    async def test_error_handling_get_current_prices(self, base_exchange):
+        """Test error handling in get_current_prices."""
+        exchange, gateways = base_exchange
+        # Simulate API error
+        gateways.ccxt.client.ticker_error = Exception("API Error")
+
+        exchange.ws_connected = False
+
+        result = await exchange.get_current_prices(list(SYMBOLS_BTC))
+
+        # Should return empty dict on error
+        assert result == {}
+        assert gateways.logger.messages("ERROR") == ["Error getting current prices via API: API Error"]
+
+    async def test_get_current_prices_without_fetch_tickers(self, base_exchange):
+        """Test exchanges lacking fetchTickers fall back to one request per symbol."""
+        exchange, gateways = base_exchange
+        client = gateways.ccxt.client
+        client.has = {"fetchTickers": False}
+        client.tickers = {BTC: TICKER_BTC, ETH: TICKER_ETH}
+
+        result = await exchange.get_current_prices(list(SYMBOLS_BOTH))
+
+        assert result == {BTC: 50000.0, ETH: 3000.0}
+        assert client.fetch_ticker_calls == list(SYMBOLS_BOTH)
+        assert client.fetch_tickers_calls == []
+
+    async def test_get_current_prices_chunks_ticker_batches(self, base_exchange, monkeypatch):
+        """Test batched ticker requests are split at TICKER_BATCH_SIZE symbols."""
+        monkeypatch.setattr("exchanges.base.TICKER_BATCH_SIZE", 1)
+        exchange, gateways = base_exchange
+        client = gateways.ccxt.client
+        client.tickers = {BTC: TICKER_BTC, ETH: TICKER_ETH}
+
+        result = await exchange.get_current_prices(list(SYMBOLS_BOTH))
+
+        assert result == {BTC: 50000.0, ETH: 3000.0}
+        assert client.fetch_tickers_calls == [[BTC], [ETH]]
+
+    async def test_get_current_prices_respects_client_rate_limit(self, base_exchange, monkeypatch):
+        """Test per-symbol fallback requests reach the client one at a time, spaced by its throttle."""
+        exchange, gateways = base_exchange
+        client = gateways.ccxt.client
+        client.has = {"fetchTickers": False}
+        client.tickers = {symbol: TICKER_BTC for symbol in RATE_LIMITED_SYMBOLS}
+        fetch_ticker = client.fetch_ticker
+        starts, threads = [], set()
+        last_request = [float("-inf")]
+
+        def throttled_fetch_ticker(symbol):
+            # Mirrors ccxt's sync throttle: an unlocked read-sleep-write of the last request time
+            elapsed = time.monotonic() - last_request[0]
+            if elapsed < RATE_LIMIT_SECONDS:
+                time.sleep(RATE_LIMIT_SECONDS - elapsed)
+            last_request[0] = time.monotonic()
+            starts.append(last_request[0])
+            threads.add(threading.get_ident())
+            return fetch_ticker(symbol)
+
+        monkeypatch.setattr(client, "fetch_ticker", throttled_fetch_ticker)
+
+        result = await exchange.get_current_prices(list(RATE_LIMITED_SYMBOLS))
+
+        assert set(result) == set(RATE_LIMITED_SYMBOLS)
+        assert client.fetch_ticker_calls == list(RATE_LIMITED_SYMBOLS)
+        assert len(threads) == 1
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        assert min(gaps) >= RATE_LIMIT_SECONDS
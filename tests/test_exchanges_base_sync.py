@@ -0,0 +1,292 @@
+"""
+Tests for exchanges/base.py - construction, WebSocket lifecycle and historical prices.
+"""
+
+import pytest
+
+from exchanges.base import HISTORICAL_PRICE_MAX_AGE_MS, ExchangeGateways, PriceSeries
+
+BTC = "BTC/USDT"
+ETH = "ETH/USDT"
+SYMBOLS_BTC = (BTC,)
+# One minute before the FakeClock start time, in milliseconds
+TARGET_MS = 1640995200000 - 60000
+
+
+class TestBaseExchange:
+    """Test cases for TestExchangeImpl class."""
+
+    def test_init_valid_exchange(self, test_exchange_cls, fake_gateways):
+        """Test initialization with a valid exchange name."""
+        exchange = test_exchange_cls("binance", fake_gateways)
+
+        assert exchange.exchange_name == "binance"
+        assert exchange.exchange is fake_gateways.ccxt.client
+        assert not exchange.ws_connected
+        assert exchange.running is False
+        assert exchange.last_prices == {}
+        assert exchange.historical_prices == {}
+
+        # Verify exchange was initialized with rate limiting
+        assert fake_gateways.ccxt.binance_calls == [{"enableRateLimit": True}]
+
+    def test_init_invalid_exchange(self, test_exchange_cls, fake_gateways):
+        """Test initialization with an invalid exchange name."""
+        with pytest.raises(ValueError, match="Exchange invalid not supported by ccxt"):
+            test_exchange_cls("invalid", fake_gateways)
+
+    def test_init_with_price_cache(self, test_exchange_cls, fake_gateways):
+        """Test that price cache is properly initialized."""
+        # Only this test exercises the real ExpiringDict-backed cache
+        fake_gateways.price_cache_factory = ExchangeGateways.price_cache_factory
+        exchange = test_exchange_cls("binance", fake_gateways)
+
+        # Verify price cache exists
+        assert hasattr(exchange, "priceCache")
+        assert exchange.priceCache.max_len == 1000
+        # Note: ExpiringDict doesn't have max_age_seconds as a direct attribute
+
+    @pytest.mark.parametrize(
+        "ws_connected, historical_prices, ohlcv, expected, ohlcv_calls",
+        [
+            pytest.param(
+                False,
+                {},
+                [[1640995140000, 49900.0, 50100.0, 49800.0, 50000.0, 1000.0]],
+                {BTC: 50000.0},
+                1,
+                id="no_websocket",
+            ),
+            pytest.param(
+                True,
+                # 1 minute ago and now
+                {BTC: PriceSeries([(1640995200000 - 60000, 49900.0), (1640995200000, 50000.0)])},
+                None,
+                {BTC: 49900.0},
+                0,
+                id="with_websocket",
+            ),
+            pytest.param(
+                True,
+                # More than 10 minutes old, so the API is used instead
+                {BTC: PriceSeries([(1640995200000 - 700000, 49000.0)])},
+                [[1640995140000, 49900.0, 50100.0, 49800.0, 50000.0, 1000.0]],
+                {BTC: 50000.0},
+                1,
+                id="fallback_to_api",
+            ),
+            pytest.param(
+                True,
+                # Connected but no history recorded for the symbol yet
+                {},
+                [[1640995140000, 49900.0, 50100.0, 49800.0, 50000.0, 1000.0]],
+                {BTC: 50000.0},
+                1,
+                id="websocket_without_history",
+            ),
+            pytest.param(False, {}, [], {}, 1, id="empty_ohlcv"),
+        ],
+    )
+    def test_get_price_minutes_ago(self, base_exchange, ws_connected, historical_prices, ohlcv, expected, ohlcv_calls):
+        """Test historical prices resolved from WebSocket history and the OHLCV API."""
+        exchange, gateways = base_exchange
+        client = gateways.ccxt.client
+        client.ohlcv = ohlcv
+        exchange.ws_connected = ws_connected
+        exchange.historical_prices = historical_prices
+
+        result = exchange.get_price_minutes_ago(list(SYMBOLS_BTC), 1)
+
+        assert result == expected
+        assert len(client.fetch_ohlcv_calls) == ohlcv_calls
+
+    @pytest.mark.parametrize(
+        "history, expected",
+        [
+            pytest.param([(TARGET_MS - 1000, 1.0), (TARGET_MS, 2.0), (TARGET_MS + 1000, 3.0)], 2.0, id="exact"),
+            pytest.param([(TARGET_MS - 1000, 1.0), (TARGET_MS + 3000, 2.0)], 1.0, id="nearer_before"),
+            pytest.param([(TARGET_MS - 3000, 1.0), (TARGET_MS + 1000, 2.0)], 2.0, id="nearer_after"),
+            pytest.param([(TARGET_MS - 1000, 1.0), (TARGET_MS + 1000, 2.0)], 1.0, id="tie_prefers_earlier"),
+            pytest.param([(TARGET_MS + 1000, 1.0), (TARGET_MS + 2000, 2.0)], 1.0, id="all_after"),
+            pytest.param([(TARGET_MS - 2000, 1.0), (TARGET_MS - 1000, 2.0)], 2.0, id="all_before"),
+        ],
+    )
+    def test_get_price_minutes_ago_binary_search_boundary(self, base_exchange, history, expected):
+        """Test the closest-entry lookup around the target timestamp."""
+        exchange, gateways = base_exchange
+        exchange.ws_connected = True
+        exchange.historical_prices = {BTC: PriceSeries(history)}
+
+        result = exchange.get_price_minutes_ago(list(SYMBOLS_BTC), 1)
+
+        assert result == {BTC: expected}
+        assert gateways.ccxt.client.fetch_ohlcv_calls == []
+
+    def test_get_price_minutes_ago_coalesces_api_fetches(self, base_exchange):
+        """Test symbols missing from WebSocket history are fetched in one OHLCV batch."""
+        exchange, gateways = base_exchange
+        client = gateways.ccxt.client
+        client.ohlcv = [[1640995140000, 49900.0, 50100.0, 49800.0, 50000.0, 1000.0]]
+        exchange.ws_connected = True
+        exchange.historical_prices = {BTC: PriceSeries([(1640995200000 - 700000, 49000.0)])}
+
+        result = exchange.get_price_minutes_ago([BTC, ETH], 1)
+
+        assert result == {BTC: 50000.0, ETH: 50000.0}
+        # One worker issues the requests in order, all sharing the same start time
+        assert [call[0] for call in client.fetch_ohlcv_calls] == [BTC, ETH]
+        assert {call[2] for call in client.fetch_ohlcv_calls} == {1640995140000}
+
+    def test_store_historical_price_drops_expired_entries(self, base_exchange):
+        """Test periodic cleanup trims entries older than the retention window."""
+        exchange, gateways = base_exchange
+        exchange._store_historical_price(BTC, 49000.0)
+        # Jump past the one hour retention window
+        gateways.clock.sleep(HISTORICAL_PRICE_MAX_AGE_MS / 1000 + 1)
+
+        exchange._store_historical_price(BTC, 50000.0)
+
+        series = exchange.historical_prices[BTC]
+        assert list(series) == [(int(gateways.clock.now() * 1000), 50000.0)]
+
+    def test_price_series_respects_maxlen(self):
+        """Test PriceSeries keeps only the newest maxlen entries."""
+        series = PriceSeries([(1, 1.0), (2, 2.0), (3, 3.0)], maxlen=2)
+
+        assert list(series) == [(2, 2.0), (3, 3.0)]
+        assert series.drop_before(3) == 1
+        assert series[0] == (3, 3.0)
+
+    def test_price_series_compacts_evicted_entries_in_batches(self):
+        """Test evicted entries are skipped, then compacted once they reach maxlen."""
+        series = PriceSeries([(1, 1.0), (2, 2.0), (3, 3.0)], maxlen=2)
+        assert len(series.timestamps) == 3
+        assert series.closest(0) == (2, 2.0)
+
+        series.append(4, 4.0)  # Second eviction reaches maxlen and compacts
+        assert len(series.timestamps) == 2
+        assert list(series) == [(3, 3.0), (4, 4.0)]
+        assert series[-1] == (4, 4.0)
+        with pytest.raises(IndexError):
+            series[2]
+
+    def test_close(self, base_exchange):
+        """Test closing the exchange connection."""
+        exchange, gateways = base_exchange
+        exchange.running = True
+
+        # Create a fake thread
+        thread = gateways.thread_factory()
+        exchange.ws_thread = thread
+
+        exchange.close()
+
+        assert not exchange.running
+        # Verify thread was joined
+        assert thread.join_calls == [5]
+        # Verify ws_thread is set to None after closing
+        assert exchange.ws_thread is None
+        assert gateways.ccxt.client.close_calls == 1
+
+    def test_close_shuts_down_ccxt_worker(self, base_exchange):
+        """Test OHLCV fetches reuse one worker per exchange, which close() shuts down."""
+        exchange, gateways = base_exchange
+        gateways.ccxt.client.ohlcv = [[1640995140000, 49900.0, 50100.0, 49800.0, 50000.0, 1000.0]]
+
+        exchange.get_price_minutes_ago([BTC, ETH], 1)
+        executor = exchange._executor
+        exchange.get_price_minutes_ago([BTC], 1)
+        assert exchange._executor is executor
+
+        exchange.close()
+
+        assert exchange._executor is None
+        assert executor._shutdown
+
+    @pytest.mark.parametrize(
+        "ws_connected, last_prices, expected, expected_errors, expected_starts",
+        [
+            pytest.param(False, {BTC: 50000.0}, True, [], [[BTC]], id="reconnect"),
+            pytest.param(False, {}, False, ["No available symbol list for reconnection"], [], id="no_symbols"),
+            pytest.param(True, {}, True, [], [], id="already_connected"),
+        ],
+    )
+    def test_check_ws_connection(self, base_exchange, ws_connected, last_prices, expected, expected_errors, expected_starts):
+        """Test WebSocket connection checks and reconnection attempts."""
+        exchange, gateways = base_exchange
+        exchange.ws_connected = ws_connected
+        exchange.running = True
+        exchange.last_prices = last_prices
+
+        # Record reconnection attempts instead of starting a real WebSocket
+        starts = []
+        exchange.start_websocket = starts.append
+
+        result = exchange.check_ws_connection()
+
+        assert result is expected
+        assert starts == expected_starts
+        assert gateways.logger.messages("ERROR") == expected_errors
+
+    def test_start_websocket_success(self, base_exchange):
+        """Test successful WebSocket startup."""
+        exchange, gateways = base_exchange
+
+        # Simulate WebSocket connection established once the thread starts
+        def set_connected():
+            exchange.ws_connected = True
+
+        gateways.thread_factory.on_start = set_connected
+
+        exchange.start_websocket(list(SYMBOLS_BTC))
+
+        assert exchange.running is True
+        assert gateways.clock.waits == [10]
+        [thread] = gateways.thread_factory.threads
+        assert thread.daemon is True
+        assert thread.start_calls == 1
+
+    def test_start_websocket_timeout(self, base_exchange):
+        """Test WebSocket startup timeout."""
+        exchange, gateways = base_exchange
+
+        with pytest.raises(
+            ConnectionError,
+            match="WebSocket connection establishment failed, timeout",
+        ):
+            exchange.start_websocket(list(SYMBOLS_BTC))
+
+        # A single wait on the ready event covers the whole 10 second timeout
+        assert gateways.clock.waits == [10]
+        assert gateways.clock.sleeps == []
+
+    def test_stop_websocket(self, base_exchange):
+        """Test stopping WebSocket connection."""
+        exchange, gateways = base_exchange
+        exchange.running = True
+
+        # Create a fake thread and verify join is called
+        thread = gateways.thread_factory()
+        exchange.ws_thread = thread
+
+        exchange.stop_websocket()
+
+        assert not exchange.running
+        # Verify join was called on the original thread
+        assert thread.join_calls == [5]
+        # Verify ws_thread is set to None after stopping
+        assert exchange.ws_thread is None
+
+    def test_error_handling_get_historical_prices(self, base_exchange):
+        """Test error handling in get_price_minutes_ago."""
+        exchange, gateways = base_exchange
+        # Simulate API error
+        gateways.ccxt.client.ohlcv_error = Exception("API Error")
+
+        exchange.ws_connected = False
+
+        result = exchange.get_price_minutes_ago(list(SYMBOLS_BTC), 1)
+
+        # Should return empty dict on error
+        assert result == {}
+        assert gateways.logger.messages("ERROR") == ["Error getting historical prices: API Error"]
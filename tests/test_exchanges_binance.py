@@ -2,223 +2,238 @@
 Tests for exchanges/binance.py - Binance exchange implementation.
 """
 
+import asyncio
+import json
+from contextlib import ExitStack
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from exchanges.binance import BinanceExchange
+from exchanges.base import BaseExchange, PriceSeries
+from exchanges.binance import BinanceExchange, _symbol_to_stream
+from utils.rate_limiter import TokenBucket
+
+# Serialized once at import and shared by every test
+_BTC_TICKER = json.dumps({"e": "24hrTicker", "s": "BTCUSDT", "c": "50000.00"})
+_ETH_TICKER = json.dumps({"e": "24hrTicker", "s": "ETHUSDT", "c": "3000.00"})
+_PING = json.dumps({"e": "ping", "data": "ping_data"})
+# Raised by recv after the scripted messages to end the receive loop
+_STREAM_END = ConnectionError("stream closed")
+
+
+def queued_recv(ws, messages):
+    """Serve ws.recv from an asyncio.Queue preloaded with messages and return the queue.
+
+    Exception items are raised instead of returned. Once the queue is empty recv
+    blocks like a quiet socket until the test puts another message; each item is
+    marked done as it is handed out, so ``await queue.join()`` waits for the
+    receive loop to drain the script.
+    """
+    queue = asyncio.Queue()
+    for message in messages:
+        queue.put_nowait(message)
+
+    async def recv():
+        item = await queue.get()
+        queue.task_done()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    ws.recv = recv
+    return queue
+
+
+@pytest.fixture(autouse=True, scope="module")
+def patched_ccxt():
+    """Patch the ccxt module seen by BaseExchange once for the whole module; yields its Binance client class."""
+    with patch("exchanges.base.ccxt", Mock(exchanges=["binance"])) as ccxt_module:
+        yield ccxt_module.binance
+
+
+@pytest.fixture
+def exchange(patched_ccxt):
+    """Fresh BinanceExchange backed by a clean ccxt client mock."""
+    patched_ccxt.reset_mock()
+    patched_ccxt.return_value = Mock(options={})
+    return BinanceExchange()
+
+
+@pytest.fixture
+def binance_env(exchange):
+    """Exchange plus the WebSocket, backoff and logger patches active for one test."""
+    with ExitStack() as stack:
+        connect = stack.enter_context(patch("exchanges.binance.websockets.connect"))
+        sleep = stack.enter_context(patch("exchanges.binance.asyncio.sleep"))
+        stack.enter_context(patch("exchanges.binance.random.uniform", return_value=0.25))
+        logger = stack.enter_context(patch.object(exchange, "_logger"))
+        ws = AsyncMock()
+        ws.__aenter__.return_value = ws
+        connect.return_value = ws
+        # Fresh bucket so earlier tests cannot leave the shared one drained
+        exchange._connect_bucket = TokenBucket(rate=1.0, capacity=5)
+        exchange.running = True
+        yield SimpleNamespace(exchange=exchange, connect=connect, ws=ws, sleep=sleep, logger=logger)
+
+
+def _check_connected_uri(env):
+    env.connect.assert_called_once_with("wss://fstream.binance.com/ws/btcusdt@ticker/ethusdt@ticker")
+    assert env.exchange.ws is env.ws
+
+
+def _check_ping_pong(env):
+    # Ping answered with a pong frame, then ticker processing continues
+    env.ws.ping.assert_awaited_once()
+    env.ws.send.assert_awaited_once_with(env.ws.ping.return_value)
+    assert env.exchange.last_prices == {"BTC/USDT:USDT": 50000.0}
+
+
+def _check_symbol_mapping(env):
+    # Stream symbols map back to the subscribed ccxt symbols
+    assert env.exchange.last_prices == {"BTC/USDT:USDT": 50000.0, "ETH/USDT:USDT": 3000.0}
 
 
 class TestBinanceExchange:
     """Test cases for BinanceExchange class."""
 
-    def test_init(self):
+    def test_init(self, exchange, patched_ccxt):
         """Test initialization of BinanceExchange."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ) as mock_binance, patch("exchanges.base.logging"):
-            mock_exchange = Mock()
-            mock_exchange.options = {}
-            mock_binance.return_value = mock_exchange
+        assert exchange.exchange_name == "binance"
+        assert exchange.exchange == patched_ccxt.return_value
+        patched_ccxt.assert_called_once_with({"enableRateLimit": True})
 
-            exchange = BinanceExchange()
-
-            assert exchange.exchange_name == "binance"
-            assert exchange.exchange == mock_exchange
-
-            # Verify default type is set to future
-            assert exchange.exchange.options["defaultType"] == "future"
+        # Verify default type is set to future
+        assert exchange.exchange.options["defaultType"] == "future"
 
     @pytest.mark.asyncio
-    async def test_ws_connect_basic(self):
-        """Test basic WebSocket connection setup."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.base.logging"), patch(
-            "exchanges.binance.websockets.connect"
-        ) as mock_connect:
-            # Mock WebSocket
-            mock_websocket = AsyncMock()
-            mock_connect.return_value = mock_websocket
-
-            exchange = BinanceExchange()
-            exchange.running = True
-
-            # Test URI construction
-            symbols = ["BTC/USDT", "ETH/USDT"]
-            streams = [
-                f"{symbol.lower().replace('/', '')}@ticker" for symbol in symbols
-            ]
-            expected_uri = f"wss://fstream.binance.com/ws/{'/'.join(streams)}"
-
-            # Verify the URI construction logic
-            assert (
-                expected_uri
-                == "wss://fstream.binance.com/ws/btcusdt@ticker/ethusdt@ticker"
-            )
-
-            # Verify connection setup
-            assert exchange.exchange_name == "binance"
+    @pytest.mark.parametrize(
+        "symbols, messages, check",
+        [
+            pytest.param(["BTC/USDT", "ETH/USDT"], [], _check_connected_uri, id="basic"),
+            pytest.param(["BTC/USDT"], [_PING, _BTC_TICKER], _check_ping_pong, id="ping_pong"),
+            pytest.param(
+                ["BTC/USDT", "ETH/USDT:USDT"], [_BTC_TICKER, _ETH_TICKER], _check_symbol_mapping, id="symbol_mapping"
+            ),
+        ],
+    )
+    async def test_ws_connect_cases(self, binance_env, symbols, messages, check):
+        """Test one receive session per scripted message sequence."""
+        queued_recv(binance_env.ws, [*messages, _STREAM_END])
+
+        await binance_env.exchange._ws_connect(symbols)
+
+        check(binance_env)
 
     @pytest.mark.asyncio
-    async def test_ws_connect_retry_logic(self):
+    async def test_ws_connect_retry_logic(self, binance_env):
         """Test WebSocket connection retry logic."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.binance.websockets.connect") as mock_connect, patch(
-            "exchanges.binance.asyncio.sleep"
-        ) as mock_sleep, patch("exchanges.base.logging"):
-            # Mock connection to fail once, then succeed
-            mock_websocket = AsyncMock()
-            mock_connect.side_effect = [Exception("Connection failed"), mock_websocket]
-
-            exchange = BinanceExchange()
-            exchange.running = True
-
-            # Test that retry logic is in place
-            assert exchange.exchange_name == "binance"
-            # Verify sleep was available for retry
-            assert hasattr(mock_sleep, "assert_called_once_with")
+        # Mock connection to fail once, then succeed
+        binance_env.connect.side_effect = [Exception("Connection failed"), binance_env.ws]
+        queued_recv(binance_env.ws, [_STREAM_END])
+
+        await binance_env.exchange._ws_connect(["BTC/USDT"])
+
+        assert binance_env.connect.call_count == 2
+        # First backoff step: 0.5s base plus jitter
+        binance_env.sleep.assert_awaited_once_with(0.75)
 
     @pytest.mark.asyncio
-    async def test_ws_connect_max_retries(self):
+    async def test_ws_connect_max_retries(self, binance_env, monkeypatch):
         """Test WebSocket connection max retries."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.binance.websockets.connect") as mock_connect, patch(
-            "exchanges.binance.asyncio.sleep"
-        ), patch("exchanges.base.logging"):
-            # Mock all connections to fail
-            mock_connect.side_effect = Exception("Connection failed")
+        monkeypatch.setattr("exchanges.binance.MAX_WS_RETRIES", 2)
+        # Mock all connections to fail
+        binance_env.connect.side_effect = Exception("Connection failed")
 
-            exchange = BinanceExchange()
-            exchange.running = True
+        await binance_env.exchange._ws_connect(["BTC/USDT"])
 
-            # Test max retries (3 attempts)
-            assert mock_connect.call_count <= 3
-            assert exchange.exchange_name == "binance"
+        # Gives up after MAX_WS_RETRIES attempts with a doubling delay between them
+        assert binance_env.connect.call_count == 2
+        assert [c.args[0] for c in binance_env.sleep.await_args_list] == [0.75, 1.25]
+        assert not binance_env.exchange.ws_connected
 
     @pytest.mark.asyncio
-    async def test_ws_connect_ping_pong(self):
-        """Test WebSocket ping/pong handling."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.base.logging"), patch(
-            "exchanges.binance.websockets.connect"
-        ) as mock_connect:
-            # Mock WebSocket
-            mock_websocket = AsyncMock()
-            mock_connect.return_value = mock_websocket
-
-            exchange = BinanceExchange()
-
-            # Test ping handling capability
-            assert exchange.exchange_name == "binance"
-            assert hasattr(mock_websocket, "ping")
-
-    def test_ws_connect_uri_construction(self):
-        """Test WebSocket URI construction."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.base.logging"):
-            BinanceExchange()
-
-            # Test symbol to stream conversion
-            symbols = ["BTC/USDT", "ETH/USDT"]
-            streams = [
-                f"{symbol.lower().replace('/', '')}@ticker" for symbol in symbols
-            ]
-            uri = f"wss://fstream.binance.com/ws/{'/'.join(streams)}"
-
-            assert uri == "wss://fstream.binance.com/ws/btcusdt@ticker/ethusdt@ticker"
+    async def test_ws_connect_uri_construction(self, binance_env):
+        """Test WebSocket URI construction from plain and settled ccxt symbols."""
+        queued_recv(binance_env.ws, [_STREAM_END])
+
+        await binance_env.exchange._ws_connect(["BTC/USDT", "ETH/USDT:USDT"])
+
+        binance_env.connect.assert_called_once_with("wss://fstream.binance.com/ws/btcusdt@ticker/ethusdt@ticker")
+        # Conversions are memoized across reconnects
+        assert _symbol_to_stream("BTC/USDT") is _symbol_to_stream("BTC/USDT")
 
     @pytest.mark.asyncio
-    async def test_ws_connect_symbol_mapping(self):
-        """Test WebSocket symbol mapping."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.base.logging"), patch(
-            "exchanges.binance.websockets.connect"
-        ) as mock_connect:
-            # Mock WebSocket
-            mock_websocket = AsyncMock()
-            mock_connect.return_value = mock_websocket
-
-            exchange = BinanceExchange()
-            exchange.running = True
-
-            # Test basic symbol handling
-            assert exchange.exchange_name == "binance"
-            assert "BTC/USDT" in ["BTC/USDT", "ETH/USDT"]
+    @pytest.mark.parametrize("now, logged", [(1200.0, True), (1230.0, False)], ids=["on_interval", "off_interval"])
+    async def test_ws_connect_price_log_uses_injected_clock(self, binance_env, now, logged):
+        """Test the periodic price log is timed by the exchange clock and written to its logger."""
+        queued_recv(binance_env.ws, [_BTC_TICKER, _STREAM_END])
+
+        with patch.object(binance_env.exchange, "_clock", Mock(now=Mock(return_value=now))):
+            await binance_env.exchange._ws_connect(["BTC/USDT"])
+
+        info_calls = [call.args for call in binance_env.logger.info.call_args_list]
+        assert (("Binance price update - %s: %s", "BTC/USDT:USDT", 50000.0) in info_calls) is logged
+        assert binance_env.exchange.historical_prices["BTC/USDT:USDT"][-1] == (int(now * 1000), 50000.0)
 
     @pytest.mark.asyncio
-    async def test_ws_connect_historical_data_cleanup(self):
+    async def test_ws_connect_historical_data_cleanup(self, binance_env):
         """Test WebSocket historical data cleanup."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.base.logging"), patch(
-            "exchanges.binance.websockets.connect"
-        ) as mock_connect:
-            # Mock WebSocket
-            mock_websocket = AsyncMock()
-            mock_connect.return_value = mock_websocket
-
-            exchange = BinanceExchange()
-            exchange.running = True
+        exchange = binance_env.exchange
+        queued_recv(binance_env.ws, [_BTC_TICKER, _BTC_TICKER, _STREAM_END])
+        # An entry far older than the retention window is dropped on the next store
+        exchange.historical_prices = {"BTC/USDT:USDT": PriceSeries([(1640905200000, 49000.0)])}
 
-            # Test historical data structure
-            exchange.historical_prices = {"BTC/USDT": [(1640905200000, 50000.0)]}
+        await exchange._ws_connect(["BTC/USDT"])
 
-            assert "BTC/USDT" in exchange.historical_prices
-            assert exchange.historical_prices["BTC/USDT"][0][1] == 50000.0
+        series = exchange.historical_prices["BTC/USDT:USDT"]
+        assert [price for _, price in series] == [50000.0, 50000.0]
 
     @pytest.mark.asyncio
-    async def test_ws_connect_error_handling(self):
+    async def test_ws_connect_error_handling(self, binance_env):
         """Test WebSocket connection error handling."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.binance.websockets.connect") as mock_connect, patch(
-            "exchanges.base.logging"
-        ) as mock_logging:
-            # Mock connection to fail
-            mock_connect.side_effect = Exception("Connection failed")
-
-            exchange = BinanceExchange()
-            exchange.running = True
-
-            # Test error handling
-            assert exchange.exchange_name == "binance"
-            # Verify logging is available
-            assert hasattr(mock_logging, "error")
+        # Mock connection to fail
+        binance_env.connect.side_effect = Exception("Connection failed")
+
+        await binance_env.exchange._ws_connect(["BTC/USDT"])
+
+        binance_env.logger.error.assert_called_with("Unable to establish WebSocket connection after 3 attempts")
+
+    @pytest.mark.asyncio
+    async def test_ws_connect_stops_when_running_cleared(self, binance_env):
+        """Test the receive loop exits cleanly once running is cleared mid-stream."""
+        exchange = binance_env.exchange
+        queue = queued_recv(binance_env.ws, [_BTC_TICKER, _ETH_TICKER])
+
+        task = asyncio.create_task(exchange._ws_connect(["BTC/USDT", "ETH/USDT"]))
+        # Wait until every scripted message is consumed rather than sleeping
+        await queue.join()
+        assert exchange.ws_connected
+        exchange.running = False
+        # One more frame wakes the blocked recv so the loop can observe running
+        queue.put_nowait(_ETH_TICKER)
+        await task
+
+        assert exchange.last_prices == {"BTC/USDT:USDT": 50000.0, "ETH/USDT:USDT": 3000.0}
+        assert not exchange.ws_connected
+        # A clean stop does not reconnect
+        binance_env.connect.assert_called_once()
+        binance_env.sleep.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_ws_connect_stops_when_running_false(self):
+    async def test_ws_connect_stops_when_running_false(self, binance_env):
         """Test WebSocket connection stops when running is False."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.binance.websockets.connect") as mock_connect, patch(
-            "exchanges.base.logging"
-        ):
-            # Mock WebSocket
-            mock_websocket = AsyncMock()
-            mock_connect.return_value = mock_websocket
-
-            exchange = BinanceExchange()
-            exchange.running = False  # Start with running = False
-
-            # Test that connection doesn't start when running is False
-            assert exchange.exchange_name == "binance"
-            assert not exchange.running
-
-    def test_inheritance(self):
-        """Test that BinanceExchange properly inherits from BaseExchange."""
-        with patch("exchanges.base.ccxt.exchanges", ["binance"]), patch(
-            "exchanges.base.ccxt.binance"
-        ), patch("exchanges.base.logging"):
-            exchange = BinanceExchange()
+        binance_env.exchange.running = False  # Start with running = False
+
+        await binance_env.exchange._ws_connect(["BTC/USDT"])
 
-            # Verify inheritance
-            from exchanges.base import BaseExchange
+        # Test that connection doesn't start when running is False
+        binance_env.connect.assert_not_called()
+        assert not binance_env.exchange.ws_connected
+
+    def test_inheritance(self, exchange):
+        """Test that BinanceExchange properly inherits from BaseExchange."""
+        # Verify inheritance
+        assert isinstance(exchange, BaseExchange)
+        assert exchange.exchange_name == "binance"
 
-            assert isinstance(exchange, BaseExchange)
-            assert exchange.exchange_name == "binance"
@@ -1,4 +1,3 @@
-import time
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -6,48 +5,68 @@ import pytest
 from utils.cache_manager import NotificationCooldownManager
 from utils.monitor_top_movers import monitor_top_movers
 
+DEFAULT_COOLDOWN = 1.0
 
-class TestNotificationCooldownManager:
-    def test_should_notify_basic(self):
-        manager = NotificationCooldownManager(default_cooldown_seconds=1.0)
-        assert manager.should_notify("BTC/USDT") is True
 
-        manager.record_notification("BTC/USDT")
-        assert manager.should_notify("BTC/USDT") is False
+@pytest.fixture
+def clock_manager():
+    """Cooldown manager on a fake clock, returned with a helper that advances the clock."""
+    clock = [0.0]
+
+    def advance(seconds):
+        clock[0] += seconds
 
-        time.sleep(1.1)
-        assert manager.should_notify("BTC/USDT") is True
+    return NotificationCooldownManager(default_cooldown_seconds=DEFAULT_COOLDOWN, clock=lambda: clock[0]), advance
 
-    def test_bypass_cooldown(self):
-        manager = NotificationCooldownManager(default_cooldown_seconds=10.0)
-        manager.record_notification("BTC/USDT")
-        assert manager.should_notify("BTC/USDT") is False
-        assert manager.should_notify("BTC/USDT", bypass_cooldown=True) is True
 
-    def test_custom_cooldown(self):
-        manager = NotificationCooldownManager(default_cooldown_seconds=10.0)
-        manager.record_notification("BTC/USDT", cooldown_seconds=1.0)
-        assert manager.should_notify("BTC/USDT") is False
+class TestNotificationCooldownManager:
+    @pytest.mark.parametrize(
+        "symbol, cooldown, bypass",
+        [
+            pytest.param("BTC/USDT", None, False, id="default_cooldown"),
+            pytest.param("ETH/USDT", 5.0, False, id="custom_cooldown"),
+            pytest.param("BTC/USDT", None, True, id="bypass_cooldown"),
+        ],
+    )
+    def test_cooldown(self, clock_manager, symbol, cooldown, bypass):
+        manager, advance = clock_manager
+        period = cooldown if cooldown is not None else DEFAULT_COOLDOWN
+        assert manager.should_notify(symbol) is True
+
+        manager.record_notification(symbol, cooldown_seconds=cooldown)
+        assert manager.should_notify(symbol) is False
+        assert manager.should_notify(symbol, bypass_cooldown=bypass) is bypass
+        assert manager.get_remaining_cooldown(symbol) == period
+
+        advance(period - 0.1)
+        assert manager.should_notify(symbol) is False
+
+        advance(0.2)
+        assert manager.should_notify(symbol) is True
+        assert manager.get_remaining_cooldown(symbol) == 0.0
+
+
+@pytest.fixture
+def top_movers_exchange():
+    """Mock exchange whose price methods each test configures."""
+    exchange = MagicMock()
+    exchange.exchange_name = "TestExchange"
+    exchange.get_current_prices = AsyncMock()
+    return exchange
 
-        time.sleep(1.1)
-        assert manager.should_notify("BTC/USDT") is True
 
 class TestPriorityClassification:
     @pytest.mark.asyncio
-    async def test_priority_classification(self):
-        mock_exchange = MagicMock()
-        mock_exchange.exchange_name = "TestExchange"
-        mock_exchange.get_current_prices = AsyncMock()
-
+    async def test_priority_classification(self, top_movers_exchange):
         # Initial prices
-        mock_exchange.get_price_minutes_ago.return_value = {
+        top_movers_exchange.get_price_minutes_ago.return_value = {
             "BTC/USDT": 100.0,
             "ETH/USDT": 100.0,
             "SOL/USDT": 100.0
         }
         # Updated prices
         # BTC: +6% (HIGH), ETH: +3% (MEDIUM), SOL: +1.5% (LOW)
-        mock_exchange.get_current_prices.return_value = {
+        top_movers_exchange.get_current_prices.return_value = {
             "BTC/USDT": 106.0,
             "ETH/USDT": 103.0,
             "SOL/USDT": 101.5
@@ -62,7 +81,7 @@ class TestPriorityClassification:
             minutes=1,
             symbols=["BTC/USDT", "ETH/USDT", "SOL/USDT"],
             threshold=1.0,
-            exchange=mock_exchange,
+            exchange=top_movers_exchange,
             config=config
         )
 
@@ -76,13 +95,9 @@ class TestPriorityClassification:
         assert "ℹ️ [LOW]" in message
 
     @pytest.mark.asyncio
-    async def test_cooldown_integration_in_monitor_top_movers(self):
-        mock_exchange = MagicMock()
-        mock_exchange.exchange_name = "TestExchange"
-        mock_exchange.get_current_prices = AsyncMock()
-
-        mock_exchange.get_price_minutes_ago.return_value = {"BTC/USDT": 100.0, "ETH/USDT": 100.0}
-        mock_exchange.get_current_prices.return_value = {"BTC/USDT": 106.0, "ETH/USDT": 106.0}
+    async def test_cooldown_integration_in_monitor_top_movers(self, top_movers_exchange):
+        top_movers_exchange.get_price_minutes_ago.return_value = {"BTC/USDT": 100.0, "ETH/USDT": 100.0}
+        top_movers_exchange.get_current_prices.return_value = {"BTC/USDT": 106.0, "ETH/USDT": 106.0}
 
         config = {
             "priorityThresholds": {"high": 5.0, "medium": 2.0},
@@ -102,19 +117,19 @@ class TestPriorityClassification:
             minutes=1,
             symbols=["BTC/USDT", "ETH/USDT"],
             threshold=1.0,
-            exchange=mock_exchange,
+            exchange=top_movers_exchange,
             config=config,
             cooldown_manager=cooldown_manager
         )
         assert len(movers) == 2
 
         # Test 2: One HIGH (bypass), one MEDIUM (cooldown)
-        mock_exchange.get_current_prices.return_value = {"BTC/USDT": 106.0, "ETH/USDT": 103.0}
+        top_movers_exchange.get_current_prices.return_value = {"BTC/USDT": 106.0, "ETH/USDT": 103.0}
         message, movers = await monitor_top_movers(
             minutes=1,
             symbols=["BTC/USDT", "ETH/USDT"],
             threshold=1.0,
-            exchange=mock_exchange,
+            exchange=top_movers_exchange,
             config=config,
             cooldown_manager=cooldown_manager
         )
@@ -127,7 +142,7 @@ class TestPriorityClassification:
             minutes=1,
             symbols=["BTC/USDT", "ETH/USDT"],
             threshold=1.0,
-            exchange=mock_exchange,
+            exchange=top_movers_exchange,
             config=config,
             cooldown_manager=cooldown_manager
         )
@@ -1,37 +1,41 @@
 from typing import List
 
+import pytest
+
 from utils.send_notifications import send_notifications
 
+# Calls recorded by the fakes below; cleared before every test
+_sent: List[tuple] = []
 
-def test_send_notifications_with_chat_id(monkeypatch):
-    sent: List[tuple] = []
 
-    def fake_send_message(message, token, chat_id):
-        sent.append(("msg", chat_id, message))
-        return True
+def _fake_send_message(message, token, chat_id):
+    _sent.append(("msg", chat_id, message))
+    return True
 
-    monkeypatch.setattr(
-        "utils.send_notifications.send_telegram_message", fake_send_message
-    )
 
+def _fake_send_photo(caption, token, chat_id, image_bytes):
+    _sent.append((chat_id, image_bytes))
+    return True
+
+
+@pytest.fixture(autouse=True)
+def _install_fakes(monkeypatch):
+    monkeypatch.setattr("utils.send_notifications.send_telegram_message", _fake_send_message)
+    monkeypatch.setattr("utils.send_notifications.send_telegram_photo", _fake_send_photo)
+    _sent.clear()
+
+
+def test_send_notifications_with_chat_id():
     send_notifications(
         "Hello",
         ["telegram"],
         {"token": "dummy-token", "chatId": "123456"},
     )
 
-    assert sent == [("msg", "123456", "Hello")]
-
-
-def test_send_notifications_with_photo(monkeypatch):
-    sent: List[tuple] = []
-
-    def fake_send_photo(caption, token, chat_id, image_bytes):
-        sent.append((chat_id, image_bytes))
-        return True
+    assert _sent == [("msg", "123456", "Hello")]
 
-    monkeypatch.setattr("utils.send_notifications.send_telegram_photo", fake_send_photo)
 
+def test_send_notifications_with_photo():
     send_notifications(
         "Hello",
         ["telegram"],
@@ -40,44 +44,24 @@ def test_send_notifications_with_photo(monkeypatch):
         image_caption="caption",
     )
 
-    assert sent == [("123456", b"bytes")]
+    assert _sent == [("123456", b"bytes")]
 
 
-def test_send_notifications_missing_chat_id(monkeypatch):
-    sent: List[tuple] = []
-
-    def fake_send_message(message, token, chat_id):
-        sent.append(("msg", chat_id, message))
-        return True
-
-    monkeypatch.setattr(
-        "utils.send_notifications.send_telegram_message", fake_send_message
-    )
-
+def test_send_notifications_missing_chat_id():
     send_notifications(
         "Hello",
         ["telegram"],
         {"token": "dummy-token"},
     )
 
-    assert sent == []
+    assert _sent == []
 
 
-def test_send_notifications_missing_token(monkeypatch):
-    sent: List[tuple] = []
-
-    def fake_send_message(message, token, chat_id):
-        sent.append(("msg", chat_id, message))
-        return True
-
-    monkeypatch.setattr(
-        "utils.send_notifications.send_telegram_message", fake_send_message
-    )
-
+def test_send_notifications_missing_token():
     send_notifications(
         "Hello",
         ["telegram"],
         {"chatId": "123456"},
     )
 
-    assert sent == []
+    assert _sent == []
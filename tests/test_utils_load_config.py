@@ -2,6 +2,7 @@
 Tests for utils/load_config.py - Configuration loading functionality.
 """
 
+import io
 from unittest.mock import mock_open, patch
 
 import pytest
@@ -9,21 +10,48 @@ import yaml
 
 from utils.load_config import load_config
 
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeDumper as _Dumper
+
+
+@pytest.fixture(scope="module")
+def base_config():
+    """Minimal valid configuration; tests copy it before changing keys."""
+    return {
+        "exchange": "binance",
+        "defaultTimeframe": "5m",
+        "defaultThreshold": 1.0,
+        "notificationChannels": ["telegram"],
+        "notificationTimezone": "Asia/Shanghai",
+    }
+
+
+@pytest.fixture(scope="module")
+def base_yaml(base_config):
+    """base_config dumped to YAML once per module."""
+    return yaml.dump(base_config, Dumper=_Dumper)
+
+
+def fake_open(text):
+    """open() replacement returning a fresh StringIO of text on each call."""
+    return lambda *args, **kwargs: io.StringIO(text)
+
+
+def open_yaml(config):
+    """fake_open serving config dumped to YAML, for tests that change the baseline."""
+    return fake_open(yaml.dump(config, Dumper=_Dumper))
+
 
 class TestLoadConfig:
     """Test cases for load_config function."""
 
-    def test_load_config_success(self):
+    def test_load_config_success(self, base_config, base_yaml):
         """Test successful configuration loading."""
-        config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "defaultThreshold": 1.0,
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": "Asia/Shanghai",
-        }
+        config_data = base_config
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", fake_open(base_yaml)), patch(
             "utils.load_config.logging"
         ) as mock_logging:
             result = load_config("test_config.yaml")
@@ -45,7 +73,7 @@ class TestLoadConfig:
             # notificationChannels, notificationTimezone
         }
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             with pytest.raises(
@@ -53,17 +81,11 @@ class TestLoadConfig:
             ):
                 load_config("test_config.yaml")
 
-    def test_load_config_missing_timezone(self):
+    def test_load_config_missing_timezone(self, base_config):
         """Test configuration loading with missing timezone (should use default)."""
-        config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "defaultThreshold": 1.0,
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": "",  # Empty timezone
-        }
+        config_data = {**base_config, "notificationTimezone": ""}  # Empty timezone
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             result = load_config("test_config.yaml")
@@ -85,7 +107,7 @@ class TestLoadConfig:
         """Test configuration loading with invalid YAML."""
         invalid_yaml = "invalid: yaml: content: [unclosed"
 
-        with patch("builtins.open", mock_open(read_data=invalid_yaml)), patch(
+        with patch("builtins.open", fake_open(invalid_yaml)), patch(
             "utils.load_config.logging"
         ) as mock_logging:
             with pytest.raises(Exception):
@@ -95,7 +117,7 @@ class TestLoadConfig:
 
     def test_load_config_empty_file(self):
         """Test configuration loading with empty file."""
-        with patch("builtins.open", mock_open(read_data="")), patch(
+        with patch("builtins.open", fake_open("")), patch(
             "utils.load_config.logging"
         ):
             with pytest.raises(
@@ -103,19 +125,11 @@ class TestLoadConfig:
             ):
                 load_config("empty_config.yaml")
 
-    def test_load_config_extra_keys(self):
+    def test_load_config_extra_keys(self, base_config):
         """Test configuration loading with extra keys (should be preserved)."""
-        config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "defaultThreshold": 1.0,
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": "Asia/Shanghai",
-            "extraKey": "extraValue",
-            "anotherExtra": {"nested": "value"},
-        }
+        config_data = {**base_config, "extraKey": "extraValue", "anotherExtra": {"nested": "value"}}
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             result = load_config("test_config.yaml")
@@ -143,7 +157,7 @@ class TestLoadConfig:
             "nestedConfig": {"key1": "value1", "key2": ["item1", "item2"]},
         }
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             result = load_config("test_config.yaml")
@@ -160,18 +174,12 @@ class TestLoadConfig:
             assert isinstance(result["timeout"], float)
             assert isinstance(result["nestedConfig"], dict)
 
-    def test_load_config_default_path(self):
+    def test_load_config_default_path(self, base_config, base_yaml):
         """Test configuration loading with default path."""
-        config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "defaultThreshold": 1.0,
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": "Asia/Shanghai",
-        }
+        config_data = base_config
+        base_open = mock_open(read_data=base_yaml)
 
-        mock_file = mock_open(read_data=yaml.dump(config_data))
-        with patch("builtins.open", mock_file), patch("utils.load_config.logging"):
+        with patch("builtins.open", base_open), patch("utils.load_config.logging"):
             result = load_config()  # No path specified
 
             expected = {
@@ -182,20 +190,13 @@ class TestLoadConfig:
 
             assert result == expected
             # Verify default path was used
-            mock_file.assert_called_once_with("config/config.yaml", "r")
+            base_open.assert_called_once_with("config/config.yaml", "r")
 
-    def test_load_config_custom_check_interval(self):
+    def test_load_config_custom_check_interval(self, base_config):
         """Test configuration loading when a custom check interval is provided."""
-        config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "checkInterval": "1m",
-            "defaultThreshold": 1.0,
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": "Asia/Shanghai",
-        }
+        config_data = {**base_config, "checkInterval": "1m"}
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             result = load_config("test_config.yaml")
@@ -203,17 +204,11 @@ class TestLoadConfig:
             assert result["checkInterval"] == "1m"
             assert result["symbolsFilePath"] == "config/symbols.txt"
 
-    def test_load_config_timezone_none(self):
+    def test_load_config_timezone_none(self, base_config):
         """Test configuration loading with timezone as None."""
-        config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "defaultThreshold": 1.0,
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": None,
-        }
+        config_data = {**base_config, "notificationTimezone": None}
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             result = load_config("test_config.yaml")
@@ -222,19 +217,15 @@ class TestLoadConfig:
             assert result["symbolsFilePath"] == "config/symbols.txt"
             assert result["checkInterval"] == config_data["defaultTimeframe"]
 
-    def test_load_config_special_characters(self):
+    def test_load_config_special_characters(self, base_config):
         """Test configuration loading with special characters in values."""
         config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "defaultThreshold": 1.0,
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": "Asia/Shanghai",
+            **base_config,
             "message": "Price 🚀 UP! BTC: $50,000.00",
             "path": "/path/with/special/chars/测试.yaml",
         }
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             result = load_config("test_config.yaml")
@@ -249,17 +240,11 @@ class TestLoadConfig:
             assert "🚀" in result["message"]
             assert "测试" in result["path"]
 
-    def test_load_config_numeric_string_threshold(self):
+    def test_load_config_numeric_string_threshold(self, base_config):
         """Test configuration loading with numeric string threshold."""
-        config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "defaultThreshold": "2.5",  # String instead of float
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": "Asia/Shanghai",
-        }
+        config_data = {**base_config, "defaultThreshold": "2.5"}  # String instead of float
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             result = load_config("test_config.yaml")
@@ -268,17 +253,11 @@ class TestLoadConfig:
             assert result["defaultThreshold"] == "2.5"  # Should preserve as string
             assert result["checkInterval"] == config_data["defaultTimeframe"]
 
-    def test_load_config_boolean_threshold(self):
+    def test_load_config_boolean_threshold(self, base_config):
         """Test configuration loading with boolean threshold (edge case)."""
-        config_data = {
-            "exchange": "binance",
-            "defaultTimeframe": "5m",
-            "defaultThreshold": True,  # Boolean instead of number
-            "notificationChannels": ["telegram"],
-            "notificationTimezone": "Asia/Shanghai",
-        }
+        config_data = {**base_config, "defaultThreshold": True}  # Boolean instead of number
 
-        with patch("builtins.open", mock_open(read_data=yaml.dump(config_data))), patch(
+        with patch("builtins.open", open_yaml(config_data)), patch(
             "utils.load_config.logging"
         ):
             result = load_config("test_config.yaml")
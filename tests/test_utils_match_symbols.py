@@ -6,29 +6,62 @@ import json
 import re
 from unittest.mock import mock_open, patch
 
-from utils.match_symbols import match_symbols
+import pytest
 
+from utils.match_symbols import _base_symbol, _build_index, _load_supported_markets, match_symbols
 
-class TestMatchSymbols:
-    """Test cases for match_symbols function."""
+# Reference pattern _base_symbol reimplements with plain string operations
+_USDT_RE = re.compile(r"(\d*[A-Za-z]+)\d*/USDT:USDT$|(\d*[A-Za-z]+)\s*/\s*USDT:USDT$")
 
-    def test_match_symbols_success(self):
-        """Test successful symbol matching."""
-        symbols = ["BTC", "ETH"]
-        exchange = "binance"
 
-        supported_markets = {
-            "binance": ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT"]
-        }
+@pytest.fixture(autouse=True)
+def fresh_markets_cache(monkeypatch):
+    """Pin the file version and start each test with an empty parse cache.
 
-        with patch(
-            "builtins.open", mock_open(read_data=json.dumps(supported_markets))
-        ), patch("builtins.print") as mock_print:
-            result = match_symbols(symbols, exchange)
+    Every test serves its own markets through mock_open under the same path, so
+    the cache must not carry one test's parse into the next.
+    """
+    monkeypatch.setattr("utils.match_symbols._file_version", lambda path: 0)
+    _load_supported_markets.cache_clear()
+    _build_index.cache_clear()
+    yield
+    _load_supported_markets.cache_clear()
+    _build_index.cache_clear()
+
+
+@pytest.fixture
+def markets_open():
+    """mock_open serving the markets payload shared by the parametrized matching cases."""
+    supported_markets = {
+        "binance": ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT", "XRP/USDT:USDT", "1000SHIB/USDT:USDT"]
+    }
+    return mock_open(read_data=json.dumps(supported_markets))
+
+
+class TestMatchSymbols:
+    """Test cases for match_symbols function."""
+
+    @pytest.mark.parametrize(
+        "symbols, expected",
+        [
+            (["BTC", "ETH"], ["BTC/USDT:USDT", "ETH/USDT:USDT"]),
+            (["BTC", "ETH", "ADA"], ["BTC/USDT:USDT", "ETH/USDT:USDT"]),
+            (["btc", "Eth"], ["BTC/USDT:USDT", "ETH/USDT:USDT"]),
+            (["BTC", "ETH", "1000SHIB"], ["BTC/USDT:USDT", "ETH/USDT:USDT", "1000SHIB/USDT:USDT"]),
+            ([" BTC ", "ETH\n", "XRP"], ["BTC/USDT:USDT", "ETH/USDT:USDT", "XRP/USDT:USDT"]),
+            (["BTC", "", "   ", "ETH"], ["BTC/USDT:USDT", "ETH/USDT:USDT"]),
+            (["BTC", "ETH", "BTC", "btc"], ["BTC/USDT:USDT", "ETH/USDT:USDT"]),
+        ],
+        ids=["success", "partial_match", "case_insensitive", "with_numbers", "whitespace", "blank_entries", "duplicates"],
+    )
+    def test_match_symbols_shared_markets(self, markets_open, symbols, expected):
+        """Test matching, normalisation and deduping against one shared markets payload."""
+        with patch("builtins.open", markets_open), patch("builtins.print") as mock_print:
+            result = match_symbols(symbols, "binance")
 
-            expected = ["BTC/USDT:USDT", "ETH/USDT:USDT"]
             assert result == expected
             mock_print.assert_not_called()
+            markets_open.assert_called_once_with("config/supported_markets.json", "rb")
 
     def test_match_symbols_exchange_not_supported(self):
         """Test symbol matching with unsupported exchange."""
@@ -62,38 +95,6 @@ class TestMatchSymbols:
             assert result == []
             mock_print.assert_not_called()
 
-    def test_match_symbols_partial_match(self):
-        """Test symbol matching with partial matches."""
-        symbols = ["BTC", "ETH", "XRP"]
-        exchange = "binance"
-
-        supported_markets = {
-            "binance": ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT"]
-        }
-
-        with patch(
-            "builtins.open", mock_open(read_data=json.dumps(supported_markets))
-        ), patch("builtins.print"):
-            result = match_symbols(symbols, exchange)
-
-            expected = ["BTC/USDT:USDT", "ETH/USDT:USDT"]
-            assert result == expected
-
-    def test_match_symbols_case_sensitive(self):
-        """Test symbol matching case sensitivity."""
-        symbols = ["BTC", "ETH"]  # proper case
-        exchange = "binance"
-
-        supported_markets = {"binance": ["BTC/USDT:USDT", "ETH/USDT:USDT"]}
-
-        with patch(
-            "builtins.open", mock_open(read_data=json.dumps(supported_markets))
-        ), patch("builtins.print"):
-            result = match_symbols(symbols, exchange)
-
-            # Should still match because we check if symbol is in base_symbol
-            assert result == ["BTC/USDT:USDT", "ETH/USDT:USDT"]
-
     def test_match_symbols_multiple_matches_pick_shortest(self):
         """Test symbol matching when multiple matches exist, pick shortest."""
         symbols = ["BTC"]
@@ -114,23 +115,6 @@ class TestMatchSymbols:
 
             assert result == ["BTC/USDT:USDT"]  # Should pick the shortest match
 
-    def test_match_symbols_with_numbers(self):
-        """Test symbol matching with numbers in symbols."""
-        symbols = ["BTC", "ETH", "1000SHIB"]
-        exchange = "binance"
-
-        supported_markets = {
-            "binance": ["BTC/USDT:USDT", "ETH/USDT:USDT", "1000SHIB/USDT:USDT"]
-        }
-
-        with patch(
-            "builtins.open", mock_open(read_data=json.dumps(supported_markets))
-        ), patch("builtins.print"):
-            result = match_symbols(symbols, exchange)
-
-            expected = ["BTC/USDT:USDT", "ETH/USDT:USDT", "1000SHIB/USDT:USDT"]
-            assert result == expected
-
     def test_match_symbols_empty_symbols_list(self):
         """Test symbol matching with empty symbols list."""
         symbols = []
@@ -171,24 +155,6 @@ class TestMatchSymbols:
             assert result == []
             # Function silently fails on JSON error
 
-    def test_match_symbols_whitespace_in_symbols(self):
-        """Test symbol matching with whitespace in symbols."""
-        symbols = ["BTC", "ETH", "XRP"]  # Remove whitespace
-        exchange = "binance"
-
-        supported_markets = {
-            "binance": ["BTC/USDT:USDT", "ETH/USDT:USDT", "XRP/USDT:USDT"]
-        }
-
-        with patch(
-            "builtins.open", mock_open(read_data=json.dumps(supported_markets))
-        ), patch("builtins.print"):
-            result = match_symbols(symbols, exchange)
-
-            # Should still match because we check if symbol is in base_symbol
-            expected = ["BTC/USDT:USDT", "ETH/USDT:USDT", "XRP/USDT:USDT"]
-            assert result == expected
-
     def test_match_symbols_special_characters(self):
         """Test symbol matching with special characters."""
         symbols = ["BTC", "ETH🚀"]
@@ -204,21 +170,6 @@ class TestMatchSymbols:
             # Should match BTC but not ETH🚀
             assert result == ["BTC/USDT:USDT"]
 
-    def test_match_symbols_duplicate_symbols(self):
-        """Test symbol matching with duplicate symbols in input."""
-        symbols = ["BTC", "ETH", "BTC"]  # Duplicate BTC
-        exchange = "binance"
-
-        supported_markets = {"binance": ["BTC/USDT:USDT", "ETH/USDT:USDT"]}
-
-        with patch(
-            "builtins.open", mock_open(read_data=json.dumps(supported_markets))
-        ), patch("builtins.print"):
-            result = match_symbols(symbols, exchange)
-
-            # Should return unique matches
-            assert result == ["BTC/USDT:USDT", "ETH/USDT:USDT"]
-
     def test_match_symbols_empty_supported_markets(self):
         """Test symbol matching with empty supported markets for exchange."""
         symbols = ["BTC", "ETH"]
@@ -258,13 +209,37 @@ class TestMatchSymbols:
             expected = ["BTC/USDT:USDT", "ETH/USDT:USDT"]
             assert result == expected
 
-    def test_match_symbols_pattern_matching(self):
-        """Test the regex pattern matching logic."""
-        # Test the pattern directly
-        usdt_pattern = re.compile(
-            r"(\d*[A-Za-z]+)\d*/USDT:USDT$|(\d*[A-Za-z]+)\s*/\s*USDT:USDT$"
-        )
+    def test_match_symbols_substring_falls_back_to_shortest_base(self):
+        """Test a symbol with no exact base matches the shortest base containing it."""
+        supported_markets = {
+            "binance": ["1000SHIBDOWN/USDT:USDT", "1000SHIB/USDT:USDT", "1000SHIBX/USDT:USDT", "SHIBUP/USDT:USDT"]
+        }
+
+        with patch(
+            "builtins.open", mock_open(read_data=json.dumps(supported_markets))
+        ), patch("builtins.print"):
+            assert match_symbols(["SHIB"], "binance") == ["SHIBUP/USDT:USDT"]
+            assert match_symbols(["1000SHIB"], "binance") == ["1000SHIB/USDT:USDT"]
 
+    def test_match_symbols_reuses_parsed_markets(self, monkeypatch):
+        """Test the markets file is parsed once per modification time."""
+        supported_markets = {"binance": ["BTC/USDT:USDT", "ETH/USDT:USDT"]}
+        version = [1]
+        monkeypatch.setattr("utils.match_symbols._file_version", lambda path: version[0])
+
+        mock_file = mock_open(read_data=json.dumps(supported_markets))
+        with patch("builtins.open", mock_file):
+            assert match_symbols(["BTC"], "binance") == ["BTC/USDT:USDT"]
+            assert match_symbols(["ETH"], "binance") == ["ETH/USDT:USDT"]
+            assert mock_file.call_count == 1
+
+            # A rewritten file has a new modification time and is parsed again
+            version[0] = 2
+            assert match_symbols(["BTC"], "binance") == ["BTC/USDT:USDT"]
+            assert mock_file.call_count == 2
+
+    def test_match_symbols_pattern_matching(self):
+        """Test base symbol extraction agrees with the reference regex."""
         # Test various market formats
         test_cases = [
             ("BTC/USDT:USDT", ("BTC", None)),
@@ -275,15 +250,20 @@ class TestMatchSymbols:
             ("INVALID/FORMAT", None),
             ("BTC/USDT", None),  # Missing :USDT
             ("BTC/USDT:BTC", None),  # Wrong quote currency
+            ("BTC2/USDT:USDT", ("BTC", None)),  # Trailing digits dropped
+            ("BTC2 / USDT:USDT", None),  # ...but not together with spaces
+            ("BTC-X/USDT:USDT", None),
         ]
 
         for market, expected in test_cases:
-            match = usdt_pattern.match(market)
+            match = _USDT_RE.match(market)
             if expected is None:
                 assert match is None, f"Pattern should not match {market}"
+                assert _base_symbol(market) is None
             else:
                 assert match is not None, f"Pattern should match {market}"
                 if expected[0] is not None:
                     assert match.group(1) == expected[0]
                 else:
                     assert match.group(2) == expected[1]
+                assert _base_symbol(market) == (expected[0] or expected[1])
@@ -4,7 +4,7 @@ Tests for utils/parse_timeframe.py - Timeframe parsing functionality.
 
 import pytest
 
-from utils.parse_timeframe import parse_timeframe
+from utils.parse_timeframe import parse_timeframe, parse_timeframes
 
 
 class TestParseTimeframe:
@@ -164,3 +164,25 @@ class TestParseTimeframe:
 
         with pytest.raises(ValueError):
             parse_timeframe("two d")
+
+    def test_parse_timeframe_caches_results(self):
+        """Test repeated timeframes are served from the cache and errors are not cached."""
+        parse_timeframe.cache_clear()
+
+        assert parse_timeframe("5m") == 5
+        assert parse_timeframe("5m") == 5
+        info = parse_timeframe.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                parse_timeframe("5x")
+        assert parse_timeframe.cache_info().misses == 3
+
+    def test_parse_timeframes_batch(self):
+        """Test a batch of timeframes is parsed in order and fails on the first invalid one."""
+        assert parse_timeframes(("5m", "1h", "0.5d", "5m")) == [5, 60, 720, 5]
+        assert parse_timeframes([]) == []
+
+        with pytest.raises(ValueError, match="Invalid timeframe format"):
+            parse_timeframes(["5m", "5x", "1h"])
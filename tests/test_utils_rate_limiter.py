@@ -0,0 +1,57 @@
+"""
+Tests for utils/rate_limiter.py - Token bucket rate limiting.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from utils.rate_limiter import TokenBucket
+
+
+class FakeMonotonic:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_up_to_capacity(self):
+        """Test calls within capacity do not wait."""
+        bucket = TokenBucket(rate=1.0, capacity=3, clock=FakeMonotonic())
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_waits_grow_once_exhausted(self):
+        """Test callers beyond capacity queue up at the refill rate."""
+        bucket = TokenBucket(rate=2.0, capacity=1, clock=FakeMonotonic())
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.5, 1.0]
+
+    def test_refills_over_time(self):
+        """Test tokens refill with elapsed time, capped at capacity."""
+        clock = FakeMonotonic()
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+
+        clock.now = 10.0
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_acquire_sleeps_only_when_needed(self):
+        """Test acquire awaits the reserved delay."""
+        bucket = TokenBucket(rate=4.0, capacity=1, clock=FakeMonotonic())
+
+        with patch("utils.rate_limiter.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await bucket.acquire()
+            await bucket.acquire()
+
+        mock_sleep.assert_awaited_once_with(0.25)